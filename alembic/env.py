@@ -9,6 +9,9 @@ from app.core.config import settings
 from app.models.user import User
 from app.models.bill import Bill
 from app.models.bill_category import BillCategory
+from app.models.s3_delete_outbox import S3DeleteOutbox
+from app.models.bill_monthly_rollup import BillMonthlyRollup
+from app.models.fx_rate import FxRate
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -26,6 +29,14 @@ if config.config_file_name is not None:
 target_metadata = SQLModel.metadata
 
 
+# Database-only objects that are deliberately not mapped in app.models.
+UNMAPPED_OBJECTS = {"search_vector", "ix_bills_user_id_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return name not in UNMAPPED_OBJECTS
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +59,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -71,7 +83,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,38 @@
+"""add bill recurrence
+
+Revision ID: 0a6e4f9b3c15
+Revises: f3a8d07c21e9
+Create Date: 2025-10-21 17:48:09.530662
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6e4f9b3c15'
+down_revision: Union[str, Sequence[str], None] = 'f3a8d07c21e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bills', sa.Column('recurrence', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=True))
+    op.add_column('bills', sa.Column('recurrence_interval', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('bills', sa.Column('recurrence_end_at', sa.DateTime(), nullable=True))
+    op.add_column('bills', sa.Column('next_due_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_bills_next_due_at', 'bills', ['next_due_at'], unique=False,
+                    postgresql_where=sa.text('next_due_at IS NOT NULL AND NOT is_deleted'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bills_next_due_at', table_name='bills')
+    op.drop_column('bills', 'next_due_at')
+    op.drop_column('bills', 'recurrence_end_at')
+    op.drop_column('bills', 'recurrence_interval')
+    op.drop_column('bills', 'recurrence')
@@ -0,0 +1,29 @@
+"""add index for purging soft-deleted bills
+
+Revision ID: 3d7e5a1c9b42
+Revises: c58f2a7e9b01
+Create Date: 2025-10-28 11:02:19.618374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7e5a1c9b42'
+down_revision: Union[str, Sequence[str], None] = 'c58f2a7e9b01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bills_created_at_id_deleted', 'bills', ['created_at', 'id'],
+                    unique=False, postgresql_where=sa.text('is_deleted'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bills_created_at_id_deleted', table_name='bills')
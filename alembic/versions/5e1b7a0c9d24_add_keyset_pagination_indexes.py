@@ -0,0 +1,33 @@
+"""add keyset pagination indexes
+
+Revision ID: 5e1b7a0c9d24
+Revises: 8c2f41d9a7b3
+Create Date: 2025-10-14 09:42:51.902215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1b7a0c9d24'
+down_revision: Union[str, Sequence[str], None] = '8c2f41d9a7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bills_created_at_id', 'bills', ['created_at', 'id'], unique=False)
+    op.create_index('ix_bill_categories_user_id_created_at_id', 'bill_categories',
+                    ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_bill_categories_user_id_created_at_id', table_name='bill_categories')
+    op.drop_index('ix_bills_created_at_id', table_name='bills')
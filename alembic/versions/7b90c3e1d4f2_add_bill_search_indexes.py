@@ -0,0 +1,47 @@
+"""add bill full-text and trigram search indexes
+
+Revision ID: 7b90c3e1d4f2
+Revises: 0a6e4f9b3c15
+Create Date: 2025-10-23 12:26:54.017733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b90c3e1d4f2'
+down_revision: Union[str, Sequence[str], None] = '0a6e4f9b3c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Lets GIN indexes lead with the scalar user_id column.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    op.execute(
+        "ALTER TABLE bills ADD COLUMN search_vector tsvector"
+        " GENERATED ALWAYS AS (to_tsvector('simple', coalesce(title, ''))) STORED"
+    )
+    op.create_index('ix_bills_user_id_search_vector', 'bills', ['user_id', 'search_vector'],
+                    unique=False, postgresql_using='gin', postgresql_where=sa.text('NOT is_deleted'))
+    op.create_index('ix_bills_user_id_title_trgm', 'bills', ['user_id', 'title'],
+                    unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+                    postgresql_where=sa.text('NOT is_deleted'))
+    # Names are only ever searched, never looked up by equality.
+    op.drop_index('ix_bill_categories_name', table_name='bill_categories')
+    op.create_index('ix_bill_categories_name_trgm', 'bill_categories', ['name'],
+                    unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bill_categories_name_trgm', table_name='bill_categories')
+    op.create_index('ix_bill_categories_name', 'bill_categories', ['name'], unique=False)
+    op.drop_index('ix_bills_user_id_title_trgm', table_name='bills')
+    op.drop_index('ix_bills_user_id_search_vector', table_name='bills')
+    op.drop_column('bills', 'search_vector')
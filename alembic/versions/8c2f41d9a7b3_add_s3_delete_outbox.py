@@ -0,0 +1,39 @@
+"""add s3_delete_outbox
+
+Revision ID: 8c2f41d9a7b3
+Revises: 36968c6747db
+Create Date: 2025-10-12 11:24:07.318452
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2f41d9a7b3'
+down_revision: Union[str, Sequence[str], None] = '36968c6747db'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('s3_delete_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('object_key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_s3_delete_outbox_next_attempt_at'), 's3_delete_outbox', ['next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_s3_delete_outbox_next_attempt_at'), table_name='s3_delete_outbox')
+    op.drop_table('s3_delete_outbox')
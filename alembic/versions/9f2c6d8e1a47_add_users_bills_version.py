@@ -0,0 +1,28 @@
+"""add users.bills_version
+
+Revision ID: 9f2c6d8e1a47
+Revises: 3d7e5a1c9b42
+Create Date: 2025-10-30 14:21:05.771934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f2c6d8e1a47'
+down_revision: Union[str, Sequence[str], None] = '3d7e5a1c9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('bills_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'bills_version')
@@ -0,0 +1,27 @@
+"""add index on s3_delete_outbox.object_key
+
+Revision ID: a4e8b2d6c913
+Revises: 9f2c6d8e1a47
+Create Date: 2025-11-03 10:37:52.184206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e8b2d6c913'
+down_revision: Union[str, Sequence[str], None] = '9f2c6d8e1a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_s3_delete_outbox_object_key'), 's3_delete_outbox', ['object_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_s3_delete_outbox_object_key'), table_name='s3_delete_outbox')
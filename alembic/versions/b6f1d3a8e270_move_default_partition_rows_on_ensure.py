@@ -0,0 +1,128 @@
+"""move rows out of the default bills partition when creating a month
+
+Revision ID: b6f1d3a8e270
+Revises: a4e8b2d6c913
+Create Date: 2025-11-04 16:08:41.529730
+
+Rows outside every monthly partition (e.g. imported history) land in
+bills_default. Plain CREATE TABLE ... PARTITION OF then fails for their
+month, and because the function creates all months in one transaction, one
+such row stopped partition maintenance altogether. The function now moves
+those rows into a standalone table and attaches it.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f1d3a8e270'
+down_revision: Union[str, Sequence[str], None] = 'a4e8b2d6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent regclass, prefix text, from_month date, months int)
+RETURNS int AS $$
+DECLARE
+    month_start date;
+    month_end date;
+    partition_name text;
+    default_partition regclass;
+    columns text;
+    has_rows boolean;
+    created int := 0;
+BEGIN
+    -- Serialize concurrent callers (several API workers run the maintainer).
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_monthly_partitions:' || parent::text));
+    SELECT NULLIF(partdefid, 0)::regclass INTO default_partition
+    FROM pg_partitioned_table WHERE partrelid = parent;
+    -- Generated columns (search_vector) can't be inserted into.
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO columns
+    FROM pg_attribute
+    WHERE attrelid = parent AND attnum > 0 AND NOT attisdropped AND attgenerated = '';
+
+    FOR i IN 0..months LOOP
+        month_start := (date_trunc('month', from_month) + make_interval(months => i))::date;
+        month_end := (month_start + interval '1 month')::date;
+        partition_name := prefix || to_char(month_start, 'YYYYMM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+        has_rows := false;
+        IF default_partition IS NOT NULL THEN
+            EXECUTE format(
+                'SELECT EXISTS (SELECT 1 FROM %s WHERE created_at >= %L AND created_at < %L)',
+                default_partition, month_start, month_end
+            ) INTO has_rows;
+        END IF;
+
+        IF has_rows THEN
+            -- Same lock order as INSERT (parent, then default); SHARE UPDATE
+            -- EXCLUSIVE is what ATTACH needs and doesn't block other writes.
+            EXECUTE format('LOCK TABLE %s IN SHARE UPDATE EXCLUSIVE MODE', parent);
+            EXECUTE format('LOCK TABLE %s IN SHARE ROW EXCLUSIVE MODE', default_partition);
+            EXECUTE format('CREATE TABLE %I (LIKE %s INCLUDING DEFAULTS INCLUDING GENERATED)', partition_name, parent);
+            -- Lets ATTACH skip scanning the new table for its range.
+            EXECUTE format(
+                'ALTER TABLE %I ADD CONSTRAINT %I CHECK (created_at >= %L AND created_at < %L)',
+                partition_name, partition_name || '_range', month_start, month_end
+            );
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM %s WHERE created_at >= %L AND created_at < %L RETURNING %s)'
+                ' INSERT INTO %I (%s) SELECT %s FROM moved',
+                default_partition, month_start, month_end, columns, partition_name, columns, columns
+            );
+            EXECUTE format(
+                'ALTER TABLE %s ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                parent, partition_name, month_start, month_end
+            );
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', partition_name, partition_name || '_range');
+        ELSE
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, month_end
+            );
+        END IF;
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END
+$$ LANGUAGE plpgsql
+"""
+
+PREVIOUS_ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent regclass, prefix text, from_month date, months int)
+RETURNS int AS $$
+DECLARE
+    month_start date;
+    partition_name text;
+    created int := 0;
+BEGIN
+    -- Serialize concurrent callers (several API workers run the maintainer).
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_monthly_partitions:' || parent::text));
+    FOR i IN 0..months LOOP
+        month_start := (date_trunc('month', from_month) + make_interval(months => i))::date;
+        partition_name := prefix || to_char(month_start, 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, (month_start + interval '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(PREVIOUS_ENSURE_PARTITIONS_FUNCTION)
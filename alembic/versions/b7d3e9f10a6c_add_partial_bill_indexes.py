@@ -0,0 +1,36 @@
+"""add partial bill indexes, drop duplicate pk indexes
+
+Revision ID: b7d3e9f10a6c
+Revises: 5e1b7a0c9d24
+Create Date: 2025-10-15 16:05:33.184027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9f10a6c'
+down_revision: Union[str, Sequence[str], None] = '5e1b7a0c9d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bills_user_id_created_at_active', 'bills', ['user_id', 'created_at', 'id'],
+                    unique=False, postgresql_where=sa.text('NOT is_deleted'))
+    # The primary keys already have a unique index each.
+    op.drop_index('ix_bills_id', table_name='bills')
+    op.drop_index('ix_bill_categories_id', table_name='bill_categories')
+    op.drop_index('ix_users_id', table_name='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_users_id', 'users', ['id'], unique=True)
+    op.create_index('ix_bill_categories_id', 'bill_categories', ['id'], unique=True)
+    op.create_index('ix_bills_id', 'bills', ['id'], unique=True)
+    op.drop_index('ix_bills_user_id_created_at_active', table_name='bills')
@@ -0,0 +1,200 @@
+"""partition bills by created_at (monthly)
+
+Revision ID: c58f2a7e9b01
+Revises: 7b90c3e1d4f2
+Create Date: 2025-10-27 09:14:37.402981
+
+The new partitioned table is filled online. Its indexes are built while it
+is still empty. A trigger then mirrors writes on the old table while the
+existing rows are copied over in small autocommitted batches. Finally both
+tables are swapped with renames under a short exclusive lock. The old table
+is kept as bills_legacy and can be dropped once the new one is verified.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58f2a7e9b01'
+down_revision: Union[str, Sequence[str], None] = '7b90c3e1d4f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, user_id, category_id, title, amount, currency, bill_image_url, is_deleted,"
+    " created_at, updated_at, recurrence, recurrence_interval, recurrence_end_at, next_due_at"
+)
+NEW_COLUMNS = ", ".join(f"NEW.{column.strip()}" for column in COLUMNS.split(","))
+
+# (name, columns, extra DDL) for every secondary index on bills.
+INDEXES = [
+    ("ix_bills_user_id", "(user_id)", ""),
+    ("ix_bills_category_id", "(category_id)", ""),
+    ("ix_bills_created_at_id", "(created_at, id)", ""),
+    ("ix_bills_user_id_created_at_active", "(user_id, created_at, id)", "WHERE NOT is_deleted"),
+    ("ix_bills_user_id_category_id_created_at_active", "(user_id, category_id, created_at, id)",
+     "WHERE NOT is_deleted"),
+    ("ix_bills_user_id_currency_created_at_active", "(user_id, currency, created_at, id)",
+     "WHERE NOT is_deleted"),
+    ("ix_bills_user_id_amount_active", "(user_id, amount)", "WHERE NOT is_deleted"),
+    ("ix_bills_next_due_at", "(next_due_at)", "WHERE next_due_at IS NOT NULL AND NOT is_deleted"),
+    ("ix_bills_user_id_title_trgm", "USING gin (user_id, title gin_trgm_ops)", "WHERE NOT is_deleted"),
+    ("ix_bills_user_id_search_vector", "USING gin (user_id, search_vector)", "WHERE NOT is_deleted"),
+]
+
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent regclass, prefix text, from_month date, months int)
+RETURNS int AS $$
+DECLARE
+    month_start date;
+    partition_name text;
+    created int := 0;
+BEGIN
+    -- Serialize concurrent callers (several API workers run the maintainer).
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_monthly_partitions:' || parent::text));
+    FOR i IN 0..months LOOP
+        month_start := (date_trunc('month', from_month) + make_interval(months => i))::date;
+        partition_name := prefix || to_char(month_start, 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, (month_start + interval '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END
+$$ LANGUAGE plpgsql
+"""
+
+MIRROR_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION bills_mirror_to_partitioned() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM bills_partitioned WHERE id = OLD.id AND created_at = OLD.created_at;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO bills_partitioned ({COLUMNS}) VALUES ({NEW_COLUMNS})
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _create_indexes(table: str, suffix: str = "") -> None:
+    for name, columns, extra in INDEXES:
+        op.execute(f"CREATE INDEX {name}{suffix} ON {table} {columns} {extra}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+
+    op.execute(
+        "CREATE TABLE bills_partitioned"
+        " (LIKE bills INCLUDING DEFAULTS INCLUDING GENERATED)"
+        " PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE bills_partitioned ADD PRIMARY KEY (id, created_at)")
+    op.execute(
+        "ALTER TABLE bills_partitioned ADD CONSTRAINT bills_p_user_id_fkey"
+        " FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+    op.execute(
+        "ALTER TABLE bills_partitioned ADD CONSTRAINT bills_p_category_id_fkey"
+        " FOREIGN KEY (category_id) REFERENCES bill_categories (id)"
+    )
+    op.execute("CREATE TABLE bills_default PARTITION OF bills_partitioned DEFAULT")
+    op.execute(
+        "SELECT ensure_monthly_partitions("
+        " 'bills_partitioned', 'bills_p',"
+        " COALESCE((SELECT min(created_at) FROM bills), now())::date,"
+        " (SELECT (extract(year FROM age(now(), COALESCE(min(created_at), now()))) * 12"
+        "  + extract(month FROM age(now(), COALESCE(min(created_at), now()))))::int FROM bills)"
+        f" + {MONTHS_AHEAD} + 1)"
+    )
+
+    # Built on the empty table, so no long index build ever blocks the mirror
+    # trigger (and with it every write to bills); the backfill maintains them.
+    _create_indexes("bills_partitioned", suffix="_p")
+
+    op.execute(MIRROR_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER bills_mirror AFTER INSERT OR UPDATE OR DELETE ON bills"
+        " FOR EACH ROW EXECUTE FUNCTION bills_mirror_to_partitioned()"
+    )
+
+    # Copy existing rows in keyset-ordered batches, each in its own transaction,
+    # so the old table stays writable throughout. FOR SHARE makes each batch
+    # wait for in-flight deletes and updates of its rows (and re-read them), and
+    # makes later ones wait for the batch, so the trigger always sees the copy
+    # and a deleted bill can't be copied back in.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last = None
+        while True:
+            where = "WHERE (created_at, id) > (:created_at, :id)" if last else ""
+            params = {"created_at": last[0], "id": last[1]} if last else {}
+            upper = connection.execute(sa.text(
+                f"SELECT created_at, id FROM bills {where}"
+                f" ORDER BY created_at, id OFFSET {BACKFILL_BATCH_SIZE - 1} LIMIT 1"
+            ), params).first()
+            bound = "AND (created_at, id) <= (:upper_created_at, :upper_id)" if upper else ""
+            if upper:
+                params.update(upper_created_at=upper[0], upper_id=upper[1])
+            connection.execute(sa.text(
+                f"INSERT INTO bills_partitioned ({COLUMNS})"
+                f" SELECT {COLUMNS} FROM bills {where or 'WHERE true'} {bound}"
+                " FOR SHARE"
+                " ON CONFLICT DO NOTHING"
+            ), params)
+            if not upper:
+                break
+            last = (upper[0], upper[1])
+
+    # Swap: metadata-only renames under a short exclusive lock.
+    op.execute("LOCK TABLE bills IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER bills_mirror ON bills")
+    op.execute("DROP FUNCTION bills_mirror_to_partitioned()")
+    op.execute("ALTER TABLE bills RENAME TO bills_legacy")
+    op.execute("ALTER TABLE bills_legacy RENAME CONSTRAINT bills_pkey TO bills_legacy_pkey")
+    for name, _, _ in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_legacy")
+    op.execute("ALTER TABLE bills_partitioned RENAME TO bills")
+    op.execute("ALTER TABLE bills RENAME CONSTRAINT bills_partitioned_pkey TO bills_pkey")
+    op.execute("ALTER TABLE bills RENAME CONSTRAINT bills_p_user_id_fkey TO bills_user_id_fkey")
+    op.execute("ALTER TABLE bills RENAME CONSTRAINT bills_p_category_id_fkey TO bills_category_id_fkey")
+    for name, _, _ in INDEXES:
+        op.execute(f"ALTER INDEX {name}_p RENAME TO {name}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS bills_legacy")
+    op.execute(
+        "CREATE TABLE bills_unpartitioned"
+        " (LIKE bills INCLUDING DEFAULTS INCLUDING GENERATED)"
+    )
+    op.execute(f"INSERT INTO bills_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM bills")
+    op.execute("DROP TABLE bills")
+    op.execute("ALTER TABLE bills_unpartitioned RENAME TO bills")
+    op.execute("ALTER TABLE bills ADD PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE bills ADD CONSTRAINT bills_user_id_fkey"
+        " FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+    op.execute(
+        "ALTER TABLE bills ADD CONSTRAINT bills_category_id_fkey"
+        " FOREIGN KEY (category_id) REFERENCES bill_categories (id)"
+    )
+    _create_indexes("bills")
+    op.execute("DROP FUNCTION ensure_monthly_partitions(regclass, text, date, int)")
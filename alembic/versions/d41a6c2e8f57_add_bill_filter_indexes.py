@@ -0,0 +1,37 @@
+"""add bill filter indexes
+
+Revision ID: d41a6c2e8f57
+Revises: b7d3e9f10a6c
+Create Date: 2025-10-16 10:17:48.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a6c2e8f57'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e9f10a6c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bills_user_id_category_id_created_at_active', 'bills',
+                    ['user_id', 'category_id', 'created_at', 'id'],
+                    unique=False, postgresql_where=sa.text('NOT is_deleted'))
+    op.create_index('ix_bills_user_id_currency_created_at_active', 'bills',
+                    ['user_id', 'currency', 'created_at', 'id'],
+                    unique=False, postgresql_where=sa.text('NOT is_deleted'))
+    op.create_index('ix_bills_user_id_amount_active', 'bills', ['user_id', 'amount'],
+                    unique=False, postgresql_where=sa.text('NOT is_deleted'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bills_user_id_amount_active', table_name='bills')
+    op.drop_index('ix_bills_user_id_currency_created_at_active', table_name='bills')
+    op.drop_index('ix_bills_user_id_category_id_created_at_active', table_name='bills')
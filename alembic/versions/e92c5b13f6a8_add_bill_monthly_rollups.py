@@ -0,0 +1,47 @@
+"""add bill_monthly_rollups
+
+Revision ID: e92c5b13f6a8
+Revises: d41a6c2e8f57
+Create Date: 2025-10-18 14:33:20.671904
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e92c5b13f6a8'
+down_revision: Union[str, Sequence[str], None] = 'd41a6c2e8f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('bill_monthly_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('category_id', sa.Uuid(), nullable=True),
+    sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('total', sa.Numeric(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'month', 'category_id', 'currency',
+                        name='uq_bill_monthly_rollups_key', postgresql_nulls_not_distinct=True)
+    )
+    # Seed from existing bills; later changes are applied incrementally by BillCRUD.
+    op.execute(
+        "INSERT INTO bill_monthly_rollups (user_id, month, category_id, currency, total, count)"
+        " SELECT user_id, date_trunc('month', created_at)::date, category_id, currency, sum(amount), count(*)"
+        " FROM bills WHERE NOT is_deleted GROUP BY 1, 2, 3, 4"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('bill_monthly_rollups')
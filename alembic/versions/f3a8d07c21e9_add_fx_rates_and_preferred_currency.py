@@ -0,0 +1,36 @@
+"""add fx_rates and users.preferred_currency
+
+Revision ID: f3a8d07c21e9
+Revises: e92c5b13f6a8
+Create Date: 2025-10-20 10:02:45.118376
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d07c21e9'
+down_revision: Union[str, Sequence[str], None] = 'e92c5b13f6a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('fx_rates',
+    sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False),
+    sa.Column('rate_date', sa.Date(), nullable=False),
+    sa.Column('rate', sa.Numeric(), nullable=False),
+    sa.PrimaryKeyConstraint('currency', 'rate_date')
+    )
+    op.add_column('users', sa.Column('preferred_currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'preferred_currency')
+    op.drop_table('fx_rates')
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
+from app.routers.analytics import router as analytics_router
 from app.routers.auth import router as auth_router
 from app.routers.bill import router as bills_router
 from app.routers.bill_category import router as bill_category_router
+from app.routers.metrics import router as metrics_router
 from app.routers.user import router as users_router
 
 api_router = APIRouter(
@@ -14,3 +16,6 @@ api_router.include_router(users_router)
 
 api_router.include_router(bills_router)
 api_router.include_router(bill_category_router)
+api_router.include_router(analytics_router)
+
+api_router.include_router(metrics_router)
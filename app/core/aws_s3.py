@@ -1,10 +1,19 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from typing import Iterable
+from uuid import uuid4
+
 import aioboto3
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 from fastapi import UploadFile, HTTPException
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import LatencyHistogram, register_collector
 
 load_dotenv()
 
@@ -17,48 +26,228 @@ s3 = boto3.client(
 )
 BUCKET_NAME = settings.AWS_S3_BUCKET
 
+# S3 rejects multipart parts smaller than 5 MiB (except the last one).
+MIN_PART_SIZE = 5 * 1024 * 1024
+# Hard limit of keys per DeleteObjects request.
+MAX_DELETE_BATCH = 1000
 
-def upload_file_to_s3(file: UploadFile, bill_id: str, folder: str = "bills") -> str:
-    """Upload image to S3 as <folder>/<bill_id>.<ext> and return key."""
-    ext = file.filename.split(".")[-1]
-    key = f"{folder}/{bill_id}.{ext}"
+_upload_semaphore = asyncio.Semaphore(settings.S3_MAX_CONCURRENT_UPLOADS)
+upload_latency = LatencyHistogram()
+register_collector("s3_upload", upload_latency.snapshot)
+
+# Cached URLs are dropped PRESIGNED_URL_CACHE_MARGIN seconds before S3 would
+# reject them, so a client never receives a URL that is about to expire.
+presigned_url_cache = TTLCache(
+    maxsize=settings.PRESIGNED_URL_CACHE_SIZE,
+    ttl=max(settings.S3_PRESIGNED_URL_EXPIRES - settings.PRESIGNED_URL_CACHE_MARGIN, 0),
+)
+register_collector("presigned_url_cache", presigned_url_cache.snapshot)
+
+
+class S3ClientManager:
+    """Owns one long-lived aioboto3 S3 client per process."""
+
+    def __init__(self) -> None:
+        self._stack: AsyncExitStack | None = None
+        self._client = None
+
+    async def init_client(self) -> None:
+        """Open the shared client; called once from the app lifespan."""
+        self._stack = AsyncExitStack()
+        self._client = await self._stack.enter_async_context(
+            aioboto3.Session().client(
+                "s3",
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_REGION,
+                config=Config(max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS),
+            )
+        )
+
+    async def close(self) -> None:
+        """Close the shared client and its connection pool."""
+        if self._stack:
+            await self._stack.aclose()
+        self._stack = None
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            raise RuntimeError("S3 client is not initialized.")
+        return self._client
 
+
+s3_manager = S3ClientManager()
+
+
+async def _multipart_upload(client, file: UploadFile, key: str, first_chunk: bytes, chunk_size: int) -> None:
+    """Stream the rest of `file` to S3 as multipart parts of `chunk_size` bytes."""
+    upload = await client.create_multipart_upload(
+        Bucket=BUCKET_NAME, Key=key, ContentType=file.content_type
+    )
+    upload_id = upload["UploadId"]
+    parts = []
     try:
-        s3.upload_fileobj(
-            file.file,
-            BUCKET_NAME,
-            key,
-            ExtraArgs={"ContentType": file.content_type},
+        chunk, part_number = first_chunk, 1
+        while chunk:
+            part = await client.upload_part(
+                Bucket=BUCKET_NAME,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=chunk,
+            )
+            parts.append({"ETag": part["ETag"], "PartNumber": part_number})
+            chunk, part_number = await file.read(chunk_size), part_number + 1
+
+        await client.complete_multipart_upload(
+            Bucket=BUCKET_NAME,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
         )
-        return key
+    except Exception:
+        await client.abort_multipart_upload(Bucket=BUCKET_NAME, Key=key, UploadId=upload_id)
+        raise
+
+
+def image_key(file: UploadFile, bill_id: str, folder: str = "bills") -> str:
+    """The key upload_file_to_s3 stores `file` under: <folder>/<bill_id>.<ext>."""
+    ext = file.filename.split(".")[-1]
+    return f"{folder}/{bill_id}.{ext}"
+
+
+def direct_upload_key(filename: str, bill_id: str, folder: str = "bills") -> str:
+    """A fresh key for a presigned upload: <folder>/<bill_id>/<random>.<ext>.
+
+    Never the key of a live image, so reserving it for deletion is safe.
+    """
+    ext = filename.split(".")[-1]
+    return f"{folder}/{bill_id}/{uuid4().hex}.{ext}"
+
+
+async def upload_file_to_s3(file: UploadFile, bill_id: str, folder: str = "bills") -> str:
+    """Upload image to S3 as <folder>/<bill_id>.<ext> and return key.
+
+    Files up to one chunk go up in a single PUT, larger ones are streamed
+    as a multipart upload. At most S3_MAX_CONCURRENT_UPLOADS run at once.
+    """
+    key = image_key(file, bill_id, folder)
+    chunk_size = max(settings.S3_UPLOAD_CHUNK_SIZE, MIN_PART_SIZE)
+
+    async with _upload_semaphore:
+        started = time.perf_counter()
+        try:
+            client = s3_manager.client
+            first_chunk = await file.read(chunk_size)
+            if len(first_chunk) < chunk_size:
+                await client.put_object(
+                    Bucket=BUCKET_NAME,
+                    Key=key,
+                    Body=first_chunk,
+                    ContentType=file.content_type,
+                )
+            else:
+                await _multipart_upload(client, file, key, first_chunk, chunk_size)
+            return key
+        except ClientError as e:
+            raise HTTPException(status_code=500, detail=f"S3 upload error: {e}")
+        finally:
+            upload_latency.observe(time.perf_counter() - started)
+
+
+def generate_presigned_url(key: str) -> str:
+    """Generate temporary download URL, reusing a cached one when still fresh."""
+    return generate_presigned_urls([key])[key]
+
+
+def generate_presigned_urls(keys: Iterable[str]) -> dict[str, str]:
+    """Return {key: download URL} for every key, signing only cache misses.
+
+    Signing is local HMAC work, so all misses are signed in a single pass
+    without yielding to the event loop.
+    """
+    urls, misses = {}, []
+    for key in keys:
+        url = presigned_url_cache.get(key)
+        if url is None:
+            misses.append(key)
+        else:
+            urls[key] = url
+
+    try:
+        for key in dict.fromkeys(misses):
+            url = s3.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": BUCKET_NAME, "Key": key},
+                ExpiresIn=settings.S3_PRESIGNED_URL_EXPIRES,
+            )
+            presigned_url_cache.set(key, url)
+            urls[key] = url
     except ClientError as e:
-        raise HTTPException(status_code=500, detail=f"S3 upload error: {e}")
+        raise HTTPException(status_code=500, detail=f"S3 presign error: {e}")
+    return urls
 
 
-def generate_presigned_url(key: str, expires_in: int = 3600) -> str:
-    """Generate temporary download URL."""
+async def generate_presigned_post(
+        key: str,
+        content_type: str,
+        max_size: int = settings.S3_MAX_IMAGE_SIZE,
+        expires_in: int = settings.S3_PRESIGNED_POST_EXPIRES,
+) -> dict:
+    """Generate a presigned POST so the client can upload `key` straight to S3."""
     try:
-        return s3.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": BUCKET_NAME, "Key": key},
+        return await s3_manager.client.generate_presigned_post(
+            Bucket=BUCKET_NAME,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_size],
+            ],
             ExpiresIn=expires_in,
         )
     except ClientError as e:
         raise HTTPException(status_code=500, detail=f"S3 presign error: {e}")
 
 
-async def delete_file_from_s3_async(file_url: str):
-    """Delete file from S3 asynchronously"""
-    if not file_url:
-        return
-    bucket = settings.AWS_S3_BUCKET
-    key = file_url.split(f"{bucket}/")[-1]
-
-    session = aioboto3.Session()
-    async with session.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION,
-    ) as s3:
-        await s3.delete_object(Bucket=bucket, Key=key)
+async def object_exists(key: str) -> bool:
+    """Return True if `key` exists in the bucket."""
+    try:
+        await s3_manager.client.head_object(Bucket=BUCKET_NAME, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise HTTPException(status_code=500, detail=f"S3 head error: {e}")
+
+
+def key_from_url(file_url: str) -> str:
+    return file_url.split(f"{BUCKET_NAME}/")[-1]
+
+
+async def delete_files_from_s3_async(file_urls: Iterable[str]) -> list[str]:
+    """Delete many files with batched DeleteObjects calls.
+
+    Keys are sent MAX_DELETE_BATCH at a time with at most
+    S3_MAX_CONCURRENT_DELETES batches in flight. Returns the keys S3
+    reported as failed.
+    """
+    keys = [key_from_url(url) for url in file_urls if url]
+    if not keys:
+        return []
+
+    semaphore = asyncio.Semaphore(settings.S3_MAX_CONCURRENT_DELETES)
+
+    async def delete_batch(batch: list[str]) -> list[str]:
+        async with semaphore:
+            response = await s3_manager.client.delete_objects(
+                Bucket=BUCKET_NAME,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+        return [error["Key"] for error in response.get("Errors", [])]
+
+    batches = [keys[i:i + MAX_DELETE_BATCH] for i in range(0, len(keys), MAX_DELETE_BATCH)]
+    results = await asyncio.gather(*(delete_batch(batch) for batch in batches))
+    return [key for failed in results for key in failed]
@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from app.core.cache import InvalidatingCache
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.schemas.bill_category import BillCategoryRead
+
+# Keyed by owner id; None holds the global default categories.
+category_cache = InvalidatingCache(maxsize=settings.CATEGORY_CACHE_SIZE, ttl=settings.CATEGORY_CACHE_TTL)
+register_collector("category_cache", category_cache.snapshot)
+
+register_invalidation_hook = category_cache.register_invalidation_hook
+evict_categories = category_cache.pop
+invalidate_categories = category_cache.invalidate
+
+
+def get_cached_categories(user_id: UUID | None) -> list[BillCategoryRead] | None:
+    """A user's categories (or the globals for None), newest first, if cached."""
+    return category_cache.get(user_id)
+
+
+def cache_categories(user_id: UUID | None, categories: list[BillCategoryRead]) -> None:
+    category_cache.set(user_id, categories)
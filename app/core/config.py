@@ -12,16 +12,78 @@ class Settings(BaseSettings):
     POSTGRES_POOL_SIZE: int
     POSTGRES_MAX_OVERFLOW: int
     POSTGRES_POOL_RECYCLE: int
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_POOL_PRE_PING: bool = False
+    POSTGRES_POOL_ADAPTIVE: bool = False
+    POSTGRES_MAX_OVERFLOW_CAP: int = 50
+    POSTGRES_POOL_TARGET_WAIT_MS: float = 5.0
+    POSTGRES_POOL_ADAPT_INTERVAL: float = 10.0
 
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
     AWS_REGION: str
     AWS_S3_BUCKET: str
+    S3_UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024
+    S3_MAX_CONCURRENT_UPLOADS: int = 8
+    S3_MAX_CONCURRENT_DELETES: int = 4
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    S3_MAX_IMAGE_SIZE: int = 10 * 1024 * 1024
+    S3_PRESIGNED_POST_EXPIRES: int = 600
+    S3_PRESIGNED_URL_EXPIRES: int = 3600
+    PRESIGNED_URL_CACHE_SIZE: int = 10_000
+    PRESIGNED_URL_CACHE_MARGIN: int = 300
+    S3_CLEANUP_BATCH_SIZE: int = 500
+    S3_CLEANUP_POLL_INTERVAL: float = 5.0
+    S3_CLEANUP_MAX_ATTEMPTS: int = 10
+    # An uploaded image is deleted after this long unless its bill was committed.
+    S3_ORPHAN_GRACE_SECONDS: float = 3600.0
 
     AWS_DB_ENDPOINT: str
     AWS_DB: str
     AWS_DB_USER: str
     AWS_DB_PASSWORD: str
+    # Comma-separated read replica hosts; empty means all reads go to the primary.
+    AWS_DB_REPLICA_ENDPOINTS: str = ""
+    DB_REPLICA_HEALTH_INTERVAL: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    BILL_IMPORT_BATCH_SIZE: int = 5000
+    BILL_IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    BILL_EXPORT_BATCH_SIZE: int = 2000
+
+    ANALYTICS_CACHE_SIZE: int = 5000
+    ANALYTICS_CACHE_TTL: float = 300.0
+
+    FX_BASE_CURRENCY: str = "USD"
+    FX_RATES_REFRESH_INTERVAL: float = 3600.0
+
+    RECURRING_BATCH_SIZE: int = 200
+    RECURRING_POLL_INTERVAL: float = 30.0
+
+    BILL_PARTITIONS_AHEAD: int = 3
+    BILL_PARTITION_MAINTENANCE_INTERVAL: float = 6 * 3600.0
+    BILL_ARCHIVE_SCHEMA: str = "archive"
+    # Imported bills may be at most this old (see partition_horizon).
+    BILL_HISTORY_YEARS: int = 30
+
+    BILL_PURGE_RETENTION_DAYS: int = 30
+    BILL_PURGE_BATCH_SIZE: int = 500
+    BILL_PURGE_INTERVAL: float = 3600.0
+    BILL_PURGE_CHUNK_PAUSE: float = 0.1
+    BILL_PURGE_MAX_REPLICATION_LAG: float = 10.0
+    BILL_PURGE_MAX_LOCK_WAITERS: int = 5
+    BILL_PURGE_THROTTLE_SLEEP: float = 5.0
+
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL: float = 60.0
+
+    CATEGORY_CACHE_SIZE: int = 10_000
+    CATEGORY_CACHE_TTL: float = 60.0
+
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_MAX_WORKERS: int = 4
+    BCRYPT_MAX_PENDING: int = 64
 
     SECRET_KEY: str
     ALGORITHM: str
@@ -38,6 +100,15 @@ class Settings(BaseSettings):
         #     f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         # )
 
+    @property
+    def DATABASE_REPLICA_URLS(self) -> list[str]:
+        return [
+            f"postgresql+asyncpg://{self.AWS_DB_USER}:{self.AWS_DB_PASSWORD}"
+            f"@{endpoint.strip()}:{self.POSTGRES_PORT}/{self.AWS_DB}"
+            for endpoint in self.AWS_DB_REPLICA_ENDPOINTS.split(",")
+            if endpoint.strip()
+        ]
+
     @property
     def DATABASE_SYNC_URL(self) -> str:
         # return (
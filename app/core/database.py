@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
 from typing import AsyncGenerator, Optional, Any, Coroutine
 
+from fastapi import HTTPException
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -9,9 +14,71 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.pool import AsyncAdaptedQueuePool
-from sqlalchemy.sql import text
 
 from app.core.config import settings
+from app.core.metrics import LatencyHistogram, register_collector
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Checkout wait times and timeouts observed by InstrumentedQueuePool."""
+
+    def __init__(self) -> None:
+        self.checkout_wait = LatencyHistogram()
+        self.recent_wait = LatencyHistogram()
+        self.timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        self.checkout_wait.observe(seconds)
+        self.recent_wait.observe(seconds)
+
+    def reset_recent(self) -> LatencyHistogram:
+        """Return the samples since the last call and start a new window."""
+        recent, self.recent_wait = self.recent_wait, LatencyHistogram()
+        return recent
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited.
+
+    Only checkouts that find the pool exhausted are timed; the others either
+    take an idle connection or open a new one, and connect latency is not
+    queueing, so they are recorded as zero wait.
+
+    Reads and writes QueuePool._max_overflow, which is private; checked
+    against SQLAlchemy 2.0.x (the range sqlmodel 0.0.25 pins).
+    """
+
+    def _must_wait(self) -> bool:
+        return (
+            self.checkedin() == 0
+            and self._max_overflow > -1
+            and self.overflow() >= self._max_overflow
+        )
+
+    def _do_get(self):
+        must_wait = self._must_wait()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        finally:
+            pool_stats.observe(time.perf_counter() - started if must_wait else 0.0)
+
+
+class Replica:
+    """A read replica engine and its last known health."""
+
+    def __init__(self, engine: AsyncEngine, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.engine = engine
+        self.session_factory = session_factory
+        self.healthy = True
 
 
 class SessionManager:
@@ -20,45 +87,176 @@ class SessionManager:
     def __init__(self) -> None:
         self.engine: Optional[AsyncEngine] = None
         self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self.replicas: list[Replica] = []
+        self._next_replica = 0
+        self._adapt_task: Optional[asyncio.Task] = None
+        self._health_task: Optional[asyncio.Task] = None
 
-    def init_db(self) -> None:
-        """Initialize the database engine and session factory."""
-        database_url = settings.DATABASE_URL
+    @staticmethod
+    def _create_engine(database_url: str, poolclass=AsyncAdaptedQueuePool) -> AsyncEngine:
+        # search_path is sent once in the connection startup packet,
+        # so checkouts don't need an extra SET round-trip. Pre-ping costs a
+        # round-trip per checkout too, so it is opt-in: pool_recycle retires
+        # old connections and a disconnect error invalidates the whole pool.
+        connect_args = {}
+        if settings.POSTGRES_SCHEMA:
+            connect_args["server_settings"] = {"search_path": settings.POSTGRES_SCHEMA}
 
-        self.engine = create_async_engine(
+        return create_async_engine(
             database_url,
-            poolclass=AsyncAdaptedQueuePool,
+            poolclass=poolclass,
             pool_size=settings.POSTGRES_POOL_SIZE,
             max_overflow=settings.POSTGRES_MAX_OVERFLOW,
-            pool_pre_ping=True,
+            pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+            pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
             pool_recycle=settings.POSTGRES_POOL_RECYCLE,
             echo=settings.DEBUG,
+            connect_args=connect_args,
         )
 
-        self.session_factory = async_sessionmaker(
-            self.engine,
+    @staticmethod
+    def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            engine,
             expire_on_commit=False,
             autoflush=False,
             class_=AsyncSession,
         )
 
+    def init_db(self) -> None:
+        """Initialize the primary and replica engines and their session factories."""
+        self.engine = self._create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool)
+        self.session_factory = self._create_session_factory(self.engine)
+
+        for url in settings.DATABASE_REPLICA_URLS:
+            engine = self._create_engine(url)
+            self.replicas.append(Replica(engine, self._create_session_factory(engine)))
+
+        register_collector("db_pool", self.pool_metrics)
+        register_collector("db_replicas", self.replica_metrics)
+
+    def replica_metrics(self) -> dict:
+        return {
+            "configured": len(self.replicas),
+            "healthy": sum(replica.healthy for replica in self.replicas),
+        }
+
+    def pool_metrics(self) -> dict:
+        """Pool gauges plus checkout wait/timeout counters."""
+        if not self.engine:
+            return {}
+        pool = self.engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": getattr(pool, "_max_overflow", None),
+            "checkout_wait": pool_stats.checkout_wait.snapshot(),
+            "checkout_timeouts": pool_stats.timeouts,
+        }
+
+    async def warm_up(self) -> None:
+        """Open pool_size connections up front so the first requests don't pay for them."""
+        if not self.engine:
+            raise RuntimeError("Database engine is not initialized.")
+        connections = await asyncio.gather(
+            *(self.engine.connect() for _ in range(settings.POSTGRES_POOL_SIZE)),
+            return_exceptions=True,
+        )
+        for connection in connections:
+            if isinstance(connection, Exception):
+                logger.warning("Pool warm-up connection failed: %r", connection)
+            else:
+                await connection.close()
+
+    def start_adaptive_sizing(self) -> None:
+        """Start resizing max_overflow from observed checkout waits.
+
+        Resizing mutates the live pool's private _max_overflow (see
+        InstrumentedQueuePool); if a SQLAlchemy upgrade drops it, sizing
+        stays static instead of failing.
+        """
+        if not hasattr(self.engine.pool, "_max_overflow"):
+            logger.warning("Pool has no _max_overflow; adaptive pool sizing disabled")
+            return
+        if self._adapt_task is None:
+            self._adapt_task = asyncio.create_task(self._adapt_pool())
+
+    async def _adapt_pool(self) -> None:
+        """Grow overflow while checkouts wait longer than the target, shrink it back when idle."""
+        target = settings.POSTGRES_POOL_TARGET_WAIT_MS / 1000
+        step = max(1, settings.POSTGRES_POOL_SIZE // 2)
+        while True:
+            await asyncio.sleep(settings.POSTGRES_POOL_ADAPT_INTERVAL)
+            pool = self.engine.pool
+            recent = pool_stats.reset_recent()
+            if recent.count and recent.percentile(99) > target:
+                new_overflow = min(pool._max_overflow + step, settings.POSTGRES_MAX_OVERFLOW_CAP)
+            elif recent.percentile(99) < target / 2 and pool.overflow() < pool._max_overflow - step:
+                new_overflow = max(pool._max_overflow - step, settings.POSTGRES_MAX_OVERFLOW)
+            else:
+                continue
+            if new_overflow != pool._max_overflow:
+                logger.info("Resizing DB pool max_overflow %d -> %d", pool._max_overflow, new_overflow)
+                pool._max_overflow = new_overflow
+
+    def start_replica_health_checks(self) -> None:
+        """Start pinging replicas so unhealthy ones are skipped for reads."""
+        if self.replicas and self._health_task is None:
+            self._health_task = asyncio.create_task(self._check_replicas())
+
+    async def _check_replicas(self) -> None:
+        while True:
+            for replica in self.replicas:
+                try:
+                    async with replica.engine.connect() as connection:
+                        await connection.execute(text("SELECT 1"))
+                    healthy = True
+                except Exception as e:
+                    logger.warning("Read replica %s unhealthy: %r", replica.engine.url.host, e)
+                    healthy = False
+                replica.healthy = healthy
+            await asyncio.sleep(settings.DB_REPLICA_HEALTH_INTERVAL)
+
+    def _read_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        """Round-robin over healthy replicas, falling back to the primary."""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next_replica % len(self.replicas)]
+            self._next_replica += 1
+            if replica.healthy:
+                return replica.session_factory
+        return self.session_factory
+
     async def close(self) -> None:
-        """Dispose of the database engine."""
+        """Dispose of the database engines."""
+        for task in (self._adapt_task, self._health_task):
+            if task:
+                task.cancel()
+        self._adapt_task = None
+        self._health_task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        self.replicas = []
         if self.engine:
             await self.engine.dispose()
 
-    async def get_session(self) -> AsyncGenerator[AsyncSession, Any]:
-        """Yield a database session with the correct schema set."""
+    async def get_session(self, read_only: bool = False) -> AsyncGenerator[AsyncSession, Any]:
+        """Yield a database session; the schema is set per connection.
+
+        With read_only=True the session comes from a healthy read replica
+        when one is configured.
+        """
         if not self.session_factory:
             raise RuntimeError("Database session factory is not initialized.")
 
-        async with self.session_factory() as session:
+        session_factory = self._read_session_factory() if read_only else self.session_factory
+        async with session_factory() as session:
             try:
-                if settings.POSTGRES_SCHEMA:
-                    await session.execute(
-                        text(f"SET search_path TO {settings.POSTGRES_SCHEMA}")
-                    )
                 yield session
+            except HTTPException:
+                await session.rollback()
+                raise
             except Exception as e:
                 await session.rollback()
                 raise RuntimeError(f"Database session error: {e!r}") from e
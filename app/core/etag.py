@@ -0,0 +1,34 @@
+import hashlib
+from typing import Any, Iterable
+
+from fastapi import Request, Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+# Responses are per user and must be revalidated on every poll; a matching
+# ETag turns the poll into an empty 304.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(parts: Iterable[Any]) -> str:
+    """Weak ETag over the string forms of `parts`."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of `etag` against the request's If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def conditional_headers(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return Response(status_code=HTTP_304_NOT_MODIFIED, headers=conditional_headers(etag, cache_control))
@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Boolean, DateTime, Float, Integer, Numeric
+from starlette.status import HTTP_400_BAD_REQUEST
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back in chunks."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+async def _csv_chunks(columns: Sequence[str], batches: AsyncIterator[list[tuple]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def _ndjson_chunks(columns: Sequence[str], batches: AsyncIterator[list[tuple]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in batch).encode()
+
+
+def _arrow_type(column_type):
+    """Arrow type for a SQLAlchemy column type; anything unmapped (UUIDs, text) becomes a string."""
+    import pyarrow as pa
+
+    if isinstance(column_type, Numeric) and not isinstance(column_type, Float):
+        # Unconstrained numeric columns get 20 integer and 18 fractional digits.
+        return pa.decimal128(column_type.precision or 38, 18 if column_type.scale is None else column_type.scale)
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    return pa.string()
+
+
+async def _parquet_chunks(columns: Sequence, batches: AsyncIterator[list[tuple]]) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # One schema fixed up front: a batch where a column happens to be all NULL
+    # must not narrow its type for the rest of the file.
+    schema = pa.schema([(column.key, _arrow_type(column.type)) for column in columns])
+    as_string = [pa.types.is_string(field.type) for field in schema]
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    async for batch in batches:
+        values = list(zip(*batch)) or [() for _ in columns]
+        table = pa.table(
+            {
+                field.name: [str(v) if v is not None else None for v in column] if string else list(column)
+                for field, string, column in zip(schema, as_string, values)
+            },
+            schema=schema,
+        )
+        writer.write_table(table)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def check_export_format(fmt: str) -> None:
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(HTTP_400_BAD_REQUEST, f"Unsupported format {fmt!r}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(HTTP_400_BAD_REQUEST, "Parquet export requires the 'parquet' extra (pyarrow)")
+
+
+async def export_chunks(
+        columns: Sequence,
+        batches: AsyncIterator[list[tuple]],
+        fmt: str,
+        compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """Encode batches of raw rows as CSV, NDJSON or Parquet (one row group per batch), optionally gzipped.
+
+    `columns` are the selected SQLAlchemy columns; Parquet takes its schema
+    from their types.
+    """
+    if fmt == "parquet":
+        chunks = _parquet_chunks(columns, batches)
+    else:
+        encoders = {"csv": _csv_chunks, "ndjson": _ndjson_chunks}
+        chunks = encoders[fmt]([column.key for column in columns], batches)
+    if not compress:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    gzip = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        compressed = gzip.compress(chunk)
+        if compressed:
+            yield compressed
+    yield gzip.flush()
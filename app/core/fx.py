@@ -0,0 +1,73 @@
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal
+from typing import Iterable
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.metrics import register_collector
+from app.core.periodic import PeriodicTask
+from app.models.fx_rate import FxRate
+
+
+class FxRateCache(PeriodicTask):
+    """In-memory exchange rates with as-of-date lookup (bisect over sorted dates per currency).
+
+    Once started, rates are reloaded from the database every `interval` seconds.
+    """
+
+    name = "FX rate refresh"
+
+    def __init__(self, base_currency: str, interval: float = settings.FX_RATES_REFRESH_INTERVAL) -> None:
+        super().__init__(interval)
+        self.base_currency = base_currency
+        self._dates: dict[str, list[date]] = {}
+        self._rates: dict[str, list[Decimal]] = {}
+
+    def replace(self, rows: Iterable[tuple[str, date, Decimal]]) -> None:
+        """Swap in a new rate set; `rows` must be ordered by (currency, rate_date)."""
+        dates: dict[str, list[date]] = {}
+        rates: dict[str, list[Decimal]] = {}
+        for currency, rate_date, rate in rows:
+            dates.setdefault(currency, []).append(rate_date)
+            rates.setdefault(currency, []).append(rate)
+        self._dates, self._rates = dates, rates
+
+    async def load(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(FxRate.currency, FxRate.rate_date, FxRate.rate).order_by(FxRate.currency, FxRate.rate_date)
+        )
+        self.replace(result.all())
+
+    async def run_once(self) -> None:
+        async for db in sessionmanager.get_session(read_only=True):
+            await self.load(db)
+
+    def rate(self, currency: str, on: date) -> Decimal:
+        """Latest rate for `currency` on or before `on`; raises LookupError if there is none."""
+        if currency == self.base_currency:
+            return Decimal(1)
+        dates = self._dates.get(currency)
+        index = bisect_right(dates, on) - 1 if dates else -1
+        if index < 0:
+            raise LookupError(f"No {currency} rate on or before {on}")
+        return self._rates[currency][index]
+
+    def convert(self, amount: Decimal, from_currency: str, to_currency: str, on: date) -> Decimal:
+        if from_currency == to_currency:
+            return amount
+        return amount * self.rate(from_currency, on) / self.rate(to_currency, on)
+
+    def snapshot(self) -> dict:
+        return {
+            "base_currency": self.base_currency,
+            "currencies": len(self._dates),
+            "rates": sum(len(dates) for dates in self._dates.values()),
+        }
+
+
+fx_rates = FxRateCache(settings.FX_BASE_CURRENCY)
+register_collector("fx_rates", fx_rates.snapshot)
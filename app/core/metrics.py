@@ -0,0 +1,42 @@
+from collections import deque
+from typing import Callable
+
+
+class LatencyHistogram:
+    """Rolling window of latency samples with percentile snapshots."""
+
+    def __init__(self, window: int = 2048) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(max(self._samples, default=0.0) * 1000, 2),
+        }
+
+
+_collectors: dict[str, Callable[[], dict]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], dict]) -> None:
+    """Register a callable returning a metrics dict under `name`."""
+    _collectors[name] = collector
+
+
+def collect() -> dict:
+    """Return a snapshot of every registered collector."""
+    return {name: collector() for name, collector in _collectors.items()}
@@ -0,0 +1,61 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from starlette.status import HTTP_400_BAD_REQUEST
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(HTTP_400_BAD_REQUEST, "Invalid cursor")
+
+
+def paginate(statement, model, cursor: str | None = None, skip: int = 0, limit: int = 10):
+    """Order `statement` newest first on (created_at, id) and apply the page window.
+
+    With a cursor the page starts right after it (keyset, index-only seek);
+    without one the legacy OFFSET is used. The redundant bound on created_at
+    alone lets the planner prune partitions, which it cannot do from the
+    row comparison.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        statement = statement.where(
+            model.created_at <= created_at,
+            tuple_(model.created_at, model.id) < (created_at, row_id),
+        )
+    elif skip:
+        statement = statement.offset(skip)
+    return statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+
+def paginate_items(items: Sequence[Any], cursor: str | None = None, skip: int = 0, limit: int = 10) -> list:
+    """Same window as paginate(), applied to rows already sorted newest first."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        items = [item for item in items if (item.created_at, item.id) < (created_at, row_id)]
+    elif skip:
+        items = items[skip:]
+    return list(items[:limit])
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> str | None:
+    """Cursor for the page after `items`, or None if this was the last page."""
+    if len(items) < limit or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
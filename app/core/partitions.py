@@ -0,0 +1,48 @@
+from datetime import date, datetime
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+# Monthly bill partitions are named bills_pYYYYMM; anything outside them lands
+# in bills_default, which ensure_monthly_partitions() drains into new months.
+PARTITION_PREFIX = "bills_p"
+
+ENSURE_PARTITIONS = text("SELECT ensure_monthly_partitions('bills', :prefix, :from_month, :months)")
+
+
+def _shift_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_horizon(now: datetime | None = None) -> tuple[datetime, datetime]:
+    """[earliest, latest) created_at a bill may be given from outside (e.g. an import).
+
+    The upper end is where PartitionMaintainer stops creating partitions; the
+    lower end keeps a typo'd year from creating a partition decades back.
+    """
+    now = now or datetime.now()
+    this_month = now.date().replace(day=1)
+    earliest = _shift_months(this_month, -12 * settings.BILL_HISTORY_YEARS)
+    latest = _shift_months(this_month, settings.BILL_PARTITIONS_AHEAD + 1)
+    return datetime.combine(earliest, datetime.min.time()), datetime.combine(latest, datetime.min.time())
+
+
+async def ensure_partition_range(db: AsyncSession, from_month: date, months: int = 0) -> int:
+    """Create the partitions for `from_month` and the `months` after it, in their own transaction."""
+    created = await db.scalar(
+        ENSURE_PARTITIONS, {"prefix": PARTITION_PREFIX, "from_month": from_month, "months": months}
+    )
+    await db.commit()
+    return created
+
+
+async def ensure_partitions(db: AsyncSession, months: Iterable[date]) -> int:
+    """Create the partitions for `months` before rows are written there; return how many were created."""
+    created = 0
+    for month in sorted(set(months)):
+        created += await ensure_partition_range(db, month)
+    return created
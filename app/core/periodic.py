@@ -0,0 +1,44 @@
+import asyncio
+import logging
+
+
+class PeriodicTask:
+    """Runs run_once() in a background task every `interval` seconds.
+
+    Subclasses implement run_once(); returning True (e.g. after a full batch)
+    runs the next pass right away instead of sleeping. Failures are logged
+    to the subclass's module logger and retried on the next pass.
+    """
+
+    name = "Periodic task"
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> bool | None:
+        raise NotImplementedError
+
+    async def _run(self) -> None:
+        logger = logging.getLogger(type(self).__module__)
+        while True:
+            try:
+                more = await self.run_once()
+            except Exception:
+                logger.exception("%s failed", self.name)
+                more = False
+            if not more:
+                await asyncio.sleep(self.interval)
@@ -0,0 +1,60 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Literal
+
+Recurrence = Literal["daily", "weekly", "monthly", "yearly"]
+
+
+PERIOD_DAYS = {"daily": 1, "weekly": 7}
+PERIOD_MONTHS = {"monthly": 1, "yearly": 12}
+
+
+def _add_months(moment: datetime, months: int) -> datetime:
+    month_index = moment.month - 1 + months
+    year, month = moment.year + month_index // 12, month_index % 12 + 1
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+
+def occurrence(anchor: datetime, recurrence: Recurrence, interval: int, index: int) -> datetime:
+    """The `index`-th occurrence after `anchor`; month ends are clamped per occurrence (Jan 31 -> Feb 28 -> Mar 31)."""
+    if recurrence in PERIOD_DAYS:
+        return anchor + timedelta(days=PERIOD_DAYS[recurrence] * interval * index)
+    if recurrence in PERIOD_MONTHS:
+        return _add_months(anchor, PERIOD_MONTHS[recurrence] * interval * index)
+    raise ValueError(f"Unknown recurrence {recurrence!r}")
+
+
+def occurrence_index(anchor: datetime, recurrence: Recurrence, interval: int, moment: datetime) -> int:
+    """Index of the occurrence `moment` falls in, counted in whole periods from `anchor`."""
+    if recurrence in PERIOD_DAYS:
+        return (moment - anchor).days // (PERIOD_DAYS[recurrence] * interval)
+    if recurrence in PERIOD_MONTHS:
+        months = (moment.year - anchor.year) * 12 + moment.month - anchor.month
+        return months // (PERIOD_MONTHS[recurrence] * interval)
+    raise ValueError(f"Unknown recurrence {recurrence!r}")
+
+
+def next_occurrence(
+        anchor: datetime,
+        recurrence: Recurrence,
+        interval: int = 1,
+        previous: datetime | None = None,
+) -> datetime:
+    """The occurrence after `previous` (or the first one), computed from `anchor` so clamping never accumulates."""
+    index = 0 if previous is None else occurrence_index(anchor, recurrence, interval, previous)
+    return occurrence(anchor, recurrence, interval, index + 1)
+
+
+def next_due(
+        anchor: datetime,
+        recurrence: Recurrence,
+        interval: int = 1,
+        end_at: datetime | None = None,
+        previous: datetime | None = None,
+) -> datetime | None:
+    """next_occurrence(), or None once it would fall after `end_at`."""
+    due_at = next_occurrence(anchor, recurrence, interval, previous)
+    if end_at and due_at > end_at:
+        return None
+    return due_at
@@ -1,9 +1,16 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Callable, TypeVar
 
 from bcrypt import hashpw, gensalt, checkpw
 from dotenv import load_dotenv
+from fastapi import HTTPException
 from jose import jwt
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from app.core.config import settings
 
 load_dotenv()
 
@@ -11,6 +18,12 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 
+T = TypeVar("T")
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop.
+_bcrypt_executor = ThreadPoolExecutor(max_workers=settings.BCRYPT_MAX_WORKERS, thread_name_prefix="bcrypt")
+_bcrypt_pending = 0
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
@@ -20,7 +33,50 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    return hashpw(password.encode("utf-8"), gensalt()).decode("utf-8")
+    return hashpw(password.encode("utf-8"), gensalt(rounds=settings.BCRYPT_ROUNDS)).decode("utf-8")
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different cost than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def _run_bcrypt(func: Callable[..., T], *args) -> T:
+    """Run a bcrypt call on the worker pool, shedding load when the queue is full."""
+    global _bcrypt_pending
+    if _bcrypt_pending >= settings.BCRYPT_MAX_PENDING:
+        raise HTTPException(
+            HTTP_503_SERVICE_UNAVAILABLE,
+            "Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+    _bcrypt_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, func, *args)
+    finally:
+        _bcrypt_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_bcrypt(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_bcrypt(get_password_hash, password)
+
+
+async def rehash_password_async(password: str) -> str | None:
+    """Best-effort hash upgrade: None instead of a 503 when the pool is full.
+
+    A skipped upgrade is retried on the user's next login.
+    """
+    try:
+        return await _run_bcrypt(get_password_hash, password)
+    except HTTPException:
+        return None
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
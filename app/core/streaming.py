@@ -0,0 +1,136 @@
+import codecs
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from starlette.status import HTTP_400_BAD_REQUEST
+
+SUPPORTED_IMPORT_FORMATS = ("csv", "ndjson")
+
+INVALID_UTF8 = "Invalid UTF-8"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[str, bool]]:
+    """Split a byte stream into decoded lines without buffering the whole body.
+
+    Yields (line, valid) with the line ending kept. A line that isn't valid
+    UTF-8 is decoded with replacement characters and valid=False, so one bad
+    row doesn't abort the whole stream.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+
+    def decode(raw: bytes) -> tuple[str, bool]:
+        try:
+            return decoder.decode(raw), True
+        except UnicodeDecodeError:
+            decoder.reset()
+            return raw.decode("utf-8", errors="replace"), False
+
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield decode(line + b"\n")
+    if buffer:
+        yield decode(buffer)
+
+
+class _LineFeed:
+    """Iterator a csv.reader pulls lines from; refilled as the stream arrives."""
+
+    def __init__(self) -> None:
+        self.lines: deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[list[str] | str]:
+    """Yield parsed CSV rows (or an error message) from a byte stream.
+
+    Lines are buffered until the quotes balance, so quoted fields may span
+    lines; then the buffered record is handed to a single csv.reader.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    quotes = 0
+    valid = True
+
+    def drain() -> list[list[str] | str]:
+        rows: list[list[str] | str] = []
+        while feed.lines:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                rows.append(f"Invalid CSV: {e}")
+                continue
+            if row:
+                rows.append(row if valid else INVALID_UTF8)
+        return rows
+
+    async for line, line_valid in iter_lines(chunks):
+        feed.lines.append(line)
+        quotes += line.count('"')
+        valid = valid and line_valid
+        if quotes % 2 == 0:
+            for row in drain():
+                yield row
+            quotes, valid = 0, True
+    for row in drain():
+        yield row
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | str]]:
+    """Yield (row_number, record) from a CSV (with header) or NDJSON stream.
+
+    A record that can't be parsed or decoded is yielded as the error message
+    instead of a dict, so the caller can report it and keep going.
+    """
+    if fmt not in SUPPORTED_IMPORT_FORMATS:
+        raise HTTPException(HTTP_400_BAD_REQUEST, f"Unsupported format {fmt!r}")
+
+    row_number = 0
+    if fmt == "csv":
+        header: list[str] | None = None
+        async for row in _iter_csv_rows(chunks):
+            if header is None:
+                if isinstance(row, str):
+                    raise HTTPException(HTTP_400_BAD_REQUEST, f"Unreadable CSV header: {row}")
+                header = row
+                continue
+
+            row_number += 1
+            if isinstance(row, str):
+                yield row_number, row
+            elif len(row) != len(header):
+                yield row_number, f"Expected {len(header)} columns, got {len(row)}"
+            else:
+                yield row_number, {key: value or None for key, value in zip(header, row)}
+        return
+
+    async for line, valid in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_number += 1
+        if not valid:
+            yield row_number, INVALID_UTF8
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, "Expected a JSON object"
+            continue
+        yield row_number, record
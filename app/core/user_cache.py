@@ -0,0 +1,21 @@
+from uuid import UUID
+
+from app.core.cache import InvalidatingCache
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.schemas.user import UserRead
+
+user_cache = InvalidatingCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+register_collector("user_cache", user_cache.snapshot)
+
+register_invalidation_hook = user_cache.register_invalidation_hook
+evict_user = user_cache.pop
+invalidate_user = user_cache.invalidate
+
+
+def get_cached_user(user_id: UUID) -> UserRead | None:
+    return user_cache.get(user_id)
+
+
+def cache_user(user: UserRead) -> None:
+    user_cache.set(user.id, user)
@@ -0,0 +1,24 @@
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.user import User
+
+# users.bills_version is bumped in the same transaction as every bill write, so
+# (user_id, version) is a cache key for anything derived from a user's bills
+# that all workers agree on and that survives restarts.
+
+
+async def bill_version(db: AsyncSession, user_id: UUID) -> int | None:
+    return await db.scalar(select(User.bills_version).where(User.id == user_id))
+
+
+async def bump_bill_version(db: AsyncSession, *user_ids: UUID) -> None:
+    """Bump the bill version of `user_ids` as part of the caller's transaction."""
+    # One row at a time in id order, so concurrent bumps can't deadlock.
+    for user_id in sorted(set(user_ids)):
+        await db.execute(
+            update(User).where(User.id == user_id).values(bills_version=User.bills_version + 1)
+        )
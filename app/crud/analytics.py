@@ -0,0 +1,74 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_collector
+from app.core.versions import bill_version
+from app.models.bill import Bill
+from app.schemas.analytics import SpendingDimension, TimeBucket
+
+spending_cache = TTLCache(maxsize=settings.ANALYTICS_CACHE_SIZE, ttl=settings.ANALYTICS_CACHE_TTL)
+register_collector("analytics_cache", spending_cache.snapshot)
+
+
+class AnalyticsCRUD:
+    """Spending aggregates computed in Postgres."""
+
+    @classmethod
+    async def get_spending(
+            cls,
+            db: AsyncSession,
+            user_id: UUID,
+            group_by: list[SpendingDimension],
+            bucket: TimeBucket | None = None,
+            date_from: datetime | None = None,
+            date_to: datetime | None = None,
+    ) -> list[dict]:
+        """Totals, counts, averages and percentiles per group.
+
+        Results are cached per user; the key includes users.bills_version, which
+        every bill write bumps in its own transaction, so older entries become
+        unreachable in every worker.
+        """
+        group_by = sorted(set(group_by), key=lambda dimension: dimension.value)
+        version = await bill_version(db, user_id)
+        cache_key = (user_id, version, tuple(group_by), bucket, date_from, date_to)
+        cached = spending_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        dimensions = []
+        if SpendingDimension.category in group_by:
+            dimensions.append(Bill.category_id.label("category_id"))
+        if SpendingDimension.currency in group_by:
+            dimensions.append(Bill.currency.label("currency"))
+        if bucket:
+            dimensions.append(func.date_trunc(bucket.value, Bill.created_at).label("bucket"))
+
+        query = (
+            select(
+                *dimensions,
+                func.sum(Bill.amount).label("total"),
+                func.count().label("count"),
+                func.avg(Bill.amount).label("average"),
+                func.percentile_cont(0.5).within_group(Bill.amount).label("p50"),
+                func.percentile_cont(0.9).within_group(Bill.amount).label("p90"),
+            )
+            .where(Bill.user_id == user_id, Bill.is_deleted == False)
+        )
+        if date_from:
+            query = query.where(Bill.created_at >= date_from)
+        if date_to:
+            query = query.where(Bill.created_at < date_to)
+        if dimensions:
+            query = query.group_by(*dimensions).order_by(*dimensions)
+
+        result = await db.execute(query)
+        groups = [dict(row._mapping) for row in result if row.count]
+        spending_cache.set(cache_key, groups)
+        return groups
@@ -1,15 +1,36 @@
-from uuid import UUID
+import re
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, literal, text, union
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_400_BAD_REQUEST
 
-from app.core.aws_s3 import delete_file_from_s3_async
-from app.models.bill import Bill
+from app.core.config import settings
+from app.core.pagination import paginate
+from app.core.partitions import ensure_partitions
+from app.core.recurrence import next_due
+from app.core.versions import bump_bill_version
+from app.crud.bill_category import BillCategoryCRUD
+from app.crud.rollup import RollupCRUD
+from app.models.bill import Bill, SEARCH_VECTOR
 from app.models.bill_category import BillCategory
-from app.models.user import User
-from app.schemas.bill import BillCreate, BillUpdate
+from app.models.s3_delete_outbox import S3DeleteOutbox
+from app.schemas.bill import BillCreate, BillFilter, BillImportRow, BillUpdate
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+# Imports only load plain history; recurring templates go through create_bill.
+IMPORT_UNSUPPORTED_FIELDS = ("recurrence", "recurrence_interval", "recurrence_end_at")
+
+IMPORT_STAGING_COLUMNS = [
+    "row_number", "id", "user_id", "category_id", "title", "amount", "currency", "created_at",
+]
 
 
 class BillCRUD:
@@ -17,49 +38,334 @@ class BillCRUD:
 
     # --- Helpers ---
     @staticmethod
-    async def _validate_fk(db: AsyncSession, category_id: UUID | None = None):
-        if category_id:
-            exists = await db.scalar(select(BillCategory.id).where(BillCategory.id == category_id))
-            if not exists:
-                raise HTTPException(HTTP_400_BAD_REQUEST, f"Category {category_id} not found")
+    async def _validate_category(db: AsyncSession, user_id: UUID, category_id: UUID | None = None):
+        if category_id and not await BillCategoryCRUD.find_usable_ids(user_id, [category_id], db):
+            raise HTTPException(HTTP_400_BAD_REQUEST, f"Category {category_id} not found")
+
+    @staticmethod
+    def _fk_error(e: IntegrityError, bill: BillCreate | BillUpdate) -> HTTPException:
+        # The asyncpg adapter copies sqlstate onto e.orig; the driver error
+        # behind it carries the constraint name.
+        if getattr(e.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION:
+            constraint = getattr(e.orig.__cause__, "constraint_name", None)
+            if constraint == "bills_category_id_fkey":
+                return HTTPException(HTTP_400_BAD_REQUEST, f"Category {bill.category_id} not found")
+            if constraint == "bills_user_id_fkey":
+                return HTTPException(HTTP_400_BAD_REQUEST, f"User {getattr(bill, 'user_id', None)} not found")
+        return HTTPException(HTTP_400_BAD_REQUEST, "Invalid bill")
 
     # --- Create ---
+    @staticmethod
+    async def reserve_image_key(db: AsyncSession, key: str) -> None:
+        """Queue `key` for deletion after S3_ORPHAN_GRACE_SECONDS, before it is uploaded.
+
+        create_bill and set_bill_image cancel the entry in the bill's
+        transaction, so an upload whose bill never commits (error, crash,
+        cancelled request, presigned upload never confirmed) is still cleaned
+        up by S3CleanupWorker. `key` must not be a live image's key.
+        """
+        await db.execute(insert(S3DeleteOutbox).values(
+            object_key=key,
+            next_attempt_at=func.now() + timedelta(seconds=settings.S3_ORPHAN_GRACE_SECONDS),
+        ))
+        await db.commit()
+
     @classmethod
-    async def create_bill(cls, db: AsyncSession, bill: BillCreate):
-        user_exists = await db.scalar(select(User.id).where(User.id == bill.user_id))
-        if not user_exists:
-            raise HTTPException(HTTP_400_BAD_REQUEST, f"User {bill.user_id} not found")
+    async def create_bill(cls, db: AsyncSession, bill: BillCreate, bill_id: UUID | None = None):
+        """Insert a bill in one INSERT ... RETURNING.
 
-        await cls._validate_fk(db, bill.category_id)
+        The category is checked against the user's cached categories; the FK
+        constraints still guard against a user or category deleted meanwhile.
+        An image key reserved with reserve_image_key is claimed in the same
+        transaction.
+        """
+        await cls._validate_category(db, bill.user_id, bill.category_id)
+        values = bill.model_dump()
+        if bill.recurrence:
+            values["created_at"] = datetime.now()
+            values["next_due_at"] = next_due(
+                values["created_at"], bill.recurrence, bill.recurrence_interval, bill.recurrence_end_at
+            )
+        stmt = insert(Bill).values(id=bill_id or uuid4(), **values).returning(Bill)
+        try:
+            db_bill = (await db.scalars(stmt)).one()
+            await RollupCRUD.apply_delta(
+                db, db_bill.user_id, db_bill.category_id, db_bill.currency, db_bill.created_at, db_bill.amount, 1
+            )
+            if bill.bill_image_url:
+                await db.execute(delete(S3DeleteOutbox).where(S3DeleteOutbox.object_key == bill.bill_image_url))
+            await bump_bill_version(db, db_bill.user_id)
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise cls._fk_error(e, bill)
+        return db_bill
 
-        db_bill = Bill(**bill.model_dump())
-        db.add(db_bill)
+    # --- Bulk import ---
+    @staticmethod
+    async def _copy_import_batch(db: AsyncSession, user_id: UUID, records: list[tuple]) -> list[int]:
+        """COPY a batch into the staging table and merge it into bills.
+
+        Returns the row numbers rejected because their category doesn't exist.
+        """
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await db.execute(text(
+            "CREATE TEMP TABLE IF NOT EXISTS bill_import_staging ("
+            " row_number integer, id uuid, user_id uuid, category_id uuid,"
+            " title varchar(255), amount numeric, currency varchar(3), created_at timestamp)"
+        ))
+        await raw.driver_connection.copy_records_to_table(
+            "bill_import_staging", records=records, columns=IMPORT_STAGING_COLUMNS
+        )
+        rejected = await db.scalars(text(
+            "SELECT s.row_number FROM bill_import_staging s"
+            " WHERE s.category_id IS NOT NULL"
+            " AND NOT EXISTS (SELECT 1 FROM bill_categories c WHERE c.id = s.category_id)"
+        ))
+        rejected_rows = list(rejected)
+        await db.execute(text(
+            "INSERT INTO bills (id, user_id, category_id, title, amount, currency,"
+            " bill_image_url, is_deleted, created_at, updated_at)"
+            " SELECT s.id, s.user_id, s.category_id, s.title, s.amount, s.currency,"
+            " NULL, false, COALESCE(s.created_at, now()), COALESCE(s.created_at, now())"
+            " FROM bill_import_staging s"
+            " WHERE s.category_id IS NULL"
+            " OR EXISTS (SELECT 1 FROM bill_categories c WHERE c.id = s.category_id)"
+        ))
+        await RollupCRUD.apply_import_staging(db)
+        await db.execute(text("TRUNCATE bill_import_staging"))
+        await bump_bill_version(db, user_id)
         await db.commit()
-        await db.refresh(db_bill)
-        return db_bill
+        return rejected_rows
+
+    @classmethod
+    async def import_bills(cls, db: AsyncSession, user_id: UUID, records: AsyncIterator[tuple[int, dict | str]]):
+        """Validate streamed records against BillCreate and load them with COPY in batches.
+
+        Memory stays bounded: at most one batch of records and
+        BILL_IMPORT_MAX_REPORTED_ERRORS error messages are held at a time.
+        """
+        imported = failed = 0
+        errors: list[dict] = []
+        batch: list[tuple] = []
+        ensured_months: set[date] = set()
+
+        def reject(row_number: int, error: str) -> None:
+            nonlocal failed
+            failed += 1
+            if len(errors) < settings.BILL_IMPORT_MAX_REPORTED_ERRORS:
+                errors.append({"row": row_number, "error": error})
+
+        async def flush() -> None:
+            nonlocal imported
+            usable = await BillCategoryCRUD.find_usable_ids(user_id, {record[3] for record in batch}, db)
+            accepted = [record for record in batch if record[3] is None or record[3] in usable]
+            for record in batch:
+                if record[3] is not None and record[3] not in usable:
+                    reject(record[0], "Category not found")
+            # Otherwise rows for a month without a partition land in bills_default.
+            months = {(record[7] or datetime.now()).date().replace(day=1) for record in accepted} - ensured_months
+            await ensure_partitions(db, months)
+            ensured_months.update(months)
+            rejected_rows = await cls._copy_import_batch(db, user_id, accepted) if accepted else []
+            for row_number in rejected_rows:
+                reject(row_number, "Category not found")
+            imported += len(accepted) - len(rejected_rows)
+            batch.clear()
+
+        async for row_number, record in records:
+            if isinstance(record, str):
+                reject(row_number, record)
+                continue
+            unsupported = [field for field in IMPORT_UNSUPPORTED_FIELDS if record.get(field) is not None]
+            if unsupported:
+                reject(row_number, f"Recurring bills can't be imported ({', '.join(unsupported)})")
+                continue
+            try:
+                row = BillImportRow(**{**record, "user_id": user_id})
+            except ValidationError as e:
+                reject(row_number, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+                continue
+            batch.append((
+                row_number, uuid4(), row.user_id, row.category_id, row.title,
+                row.amount, row.currency.upper(), row.created_at,
+            ))
+            if len(batch) >= settings.BILL_IMPORT_BATCH_SIZE:
+                await flush()
+
+        if batch:
+            await flush()
+        return {"imported": imported, "failed": failed, "errors": errors}
+
+    # --- Export ---
+    EXPORT_COLUMNS = (
+        "id", "category_id", "title", "amount", "currency", "bill_image_url", "created_at", "updated_at",
+    )
+
+    @classmethod
+    def export_columns(cls) -> list:
+        return [Bill.__table__.c[column] for column in cls.EXPORT_COLUMNS]
+
+    @classmethod
+    async def stream_bills(cls, db: AsyncSession, user_id: UUID) -> AsyncIterator[list[tuple]]:
+        """Yield a user's bills as batches of raw tuples from a server-side cursor."""
+        query = (
+            select(*cls.export_columns())
+            .where(Bill.user_id == user_id, Bill.is_deleted == False)
+            .order_by(Bill.created_at, Bill.id)
+            .execution_options(yield_per=settings.BILL_EXPORT_BATCH_SIZE)
+        )
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield [tuple(row) for row in partition]
 
     # --- Read ---
     @classmethod
-    async def get_bill(cls, bill_id: UUID, db: AsyncSession):
-        bill = await db.scalar(select(Bill).where(Bill.id == bill_id, Bill.is_deleted == False))
+    async def get_bill(cls, bill_id: UUID, db: AsyncSession, user_id: UUID | None = None):
+        """Fetch a live bill by id, optionally only if `user_id` owns it.
+
+        Without a created_at bound this probes the primary key index of every
+        partition; the row it returns carries the full (id, created_at) key, so
+        the ORM's later UPDATE/DELETE touch a single partition.
+        """
+        query = select(Bill).where(Bill.id == bill_id, Bill.is_deleted == False)
+        if user_id is not None:
+            query = query.where(Bill.user_id == user_id)
+        bill = await db.scalar(query)
         if not bill:
             raise HTTPException(HTTP_404_NOT_FOUND, f"Bill {bill_id} not found")
         return bill
 
+    @staticmethod
+    def _filter_clauses(filters: BillFilter) -> list:
+        clauses = []
+        if filters.category_id:
+            clauses.append(Bill.category_id == filters.category_id)
+        if filters.currency:
+            clauses.append(Bill.currency == filters.currency.upper())
+        if filters.date_from:
+            clauses.append(Bill.created_at >= filters.date_from)
+        if filters.date_to:
+            clauses.append(Bill.created_at < filters.date_to)
+        if filters.min_amount is not None:
+            clauses.append(Bill.amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            clauses.append(Bill.amount <= filters.max_amount)
+        return clauses
+
     @classmethod
-    async def get_bills(cls, db: AsyncSession, skip: int = 0, limit: int = 10):
-        result = await db.scalars(select(Bill).where(Bill.is_deleted == False).offset(skip).limit(limit))
+    async def get_bills(
+            cls,
+            db: AsyncSession,
+            user_id: UUID,
+            skip: int = 0,
+            limit: int = 10,
+            cursor: str | None = None,
+            filters: BillFilter | None = None,
+    ):
+        query = select(Bill).where(Bill.user_id == user_id, Bill.is_deleted == False)
+        if filters:
+            query = query.where(*cls._filter_clauses(filters))
+        result = await db.scalars(paginate(query, Bill, cursor, skip, limit))
+        return result.all()
+
+    @classmethod
+    async def get_bills_page_state(
+            cls,
+            db: AsyncSession,
+            user_id: UUID,
+            skip: int = 0,
+            limit: int = 10,
+            cursor: str | None = None,
+            filters: BillFilter | None = None,
+    ) -> list[tuple]:
+        """(id, updated_at, has_image) for the page get_bills would return, without loading the bills.
+
+        Enough to tell whether the page changed, e.g. for an ETag.
+        """
+        query = select(Bill.id, Bill.updated_at, Bill.bill_image_url.is_not(None)).where(
+            Bill.user_id == user_id, Bill.is_deleted == False
+        )
+        if filters:
+            query = query.where(*cls._filter_clauses(filters))
+        result = await db.execute(paginate(query, Bill, cursor, skip, limit))
+        return [tuple(row) for row in result.all()]
+
+    @classmethod
+    async def search_bills(cls, db: AsyncSession, user_id: UUID, q: str, limit: int = 20):
+        """Rank a user's bills by full-text match on title plus trigram similarity to title and category name.
+
+        Every term is matched as a prefix; the trigram operators tolerate typos.
+        """
+        terms = re.findall(r"\w+", q.lower())
+        if not terms:
+            raise HTTPException(HTTP_400_BAD_REQUEST, "Search query is empty")
+        ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        phrase = literal(" ".join(terms))
+
+        # One OR spanning bills and the joined categories can't be pushed into
+        # the bills scan, so each side is matched through its own indexes:
+        # the two GIN indexes on bills, and ix_bill_categories_name_trgm.
+        live = (Bill.user_id == user_id, Bill.is_deleted == False)
+        by_bill = select(Bill.id, Bill.created_at).where(
+            *live, SEARCH_VECTOR.op("@@")(ts_query) | phrase.op("<%")(Bill.title)
+        )
+        by_category = select(Bill.id, Bill.created_at).where(
+            *live, Bill.category_id.in_(select(BillCategory.id).where(phrase.op("<%")(BillCategory.name)))
+        )
+        matched = union(by_bill, by_category).subquery()
+
+        rank = (
+            func.ts_rank(SEARCH_VECTOR, ts_query)
+            + func.word_similarity(phrase, Bill.title)
+            + func.coalesce(func.word_similarity(phrase, BillCategory.name), 0)
+        )
+        query = (
+            select(Bill)
+            .join(matched, (Bill.id == matched.c.id) & (Bill.created_at == matched.c.created_at))
+            .outerjoin(BillCategory, Bill.category_id == BillCategory.id)
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+        result = await db.scalars(query)
         return result.all()
 
     # --- Update ---
     @classmethod
     async def update_bill(cls, bill_id: UUID, bill: BillUpdate, db: AsyncSession):
         db_bill = await cls.get_bill(bill_id, db)
-        await cls._validate_fk(db, bill.category_id)
+        await cls._validate_category(db, db_bill.user_id, bill.category_id)
+        before = (db_bill.category_id, db_bill.currency, db_bill.amount, db_bill.created_at)
 
         for key, value in bill.model_dump(exclude_unset=True).items():
             setattr(db_bill, key, value)
 
+        if (db_bill.category_id, db_bill.currency, db_bill.amount, db_bill.created_at) != before:
+            category_id, currency, amount, created_at = before
+            await RollupCRUD.apply_delta(db, db_bill.user_id, category_id, currency, created_at, -amount, -1)
+            await RollupCRUD.apply_delta(
+                db, db_bill.user_id, db_bill.category_id, db_bill.currency, db_bill.created_at, db_bill.amount, 1
+            )
+        await bump_bill_version(db, db_bill.user_id)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            # The category was deleted by another worker while still in our cache.
+            await db.rollback()
+            raise cls._fk_error(e, bill)
+        await db.refresh(db_bill)
+        return db_bill
+
+    @classmethod
+    async def set_bill_image(cls, bill_id: UUID, key: str, db: AsyncSession, user_id: UUID | None = None):
+        """Point a bill at `key`, claiming its reservation and queueing the replaced image for deletion."""
+        db_bill = await cls.get_bill(bill_id, db, user_id)
+        await db.execute(delete(S3DeleteOutbox).where(S3DeleteOutbox.object_key == key))
+        if db_bill.bill_image_url and db_bill.bill_image_url != key:
+            db.add(S3DeleteOutbox(object_key=db_bill.bill_image_url))
+        db_bill.bill_image_url = key
+        await bump_bill_version(db, db_bill.user_id)
         await db.commit()
         await db.refresh(db_bill)
         return db_bill
@@ -67,10 +373,12 @@ class BillCRUD:
     # --- Soft delete ---
     @classmethod
     async def delete_bill(cls, bill_id: UUID, db: AsyncSession):
+        """Flag a bill as deleted; BillPurgeJob removes it and its image after the retention window."""
         db_bill = await cls.get_bill(bill_id, db)
         db_bill.is_deleted = True
-        if db_bill.bill_image_url:
-            await delete_file_from_s3_async(db_bill.bill_image_url)
-        await db.delete(db_bill)
+        await RollupCRUD.apply_delta(
+            db, db_bill.user_id, db_bill.category_id, db_bill.currency, db_bill.created_at, -db_bill.amount, -1
+        )
+        await bump_bill_version(db, db_bill.user_id)
         await db.commit()
         return db_bill
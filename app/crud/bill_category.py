@@ -1,12 +1,22 @@
+from datetime import datetime
+from typing import Iterable
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import func, or_
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.category_cache import (
+    cache_categories,
+    evict_categories,
+    get_cached_categories,
+    invalidate_categories,
+)
+from app.core.pagination import paginate, paginate_items
 from app.models.bill_category import BillCategory
 from app.models.user import User
-from app.schemas.bill_category import BillCategoryCreate, BillCategoryUpdate
+from app.schemas.bill_category import BillCategoryCreate, BillCategoryRead, BillCategoryUpdate
 
 
 class BillCategoryCRUD:
@@ -27,6 +37,7 @@ class BillCategoryCRUD:
         db.add(db_bill_category)
         await db.commit()
         await db.refresh(db_bill_category)
+        await invalidate_categories(db_bill_category.user_id)
         return db_bill_category
 
     # Read one
@@ -38,14 +49,95 @@ class BillCategoryCRUD:
         return result.scalar()
 
     # Read Many
+    @staticmethod
+    async def _load_categories(user_id: UUID | None, db: AsyncSession) -> list[BillCategoryRead]:
+        result = await db.scalars(
+            select(BillCategory)
+            .where(BillCategory.user_id == user_id)
+            .order_by(BillCategory.created_at.desc(), BillCategory.id.desc())
+        )
+        categories = [BillCategoryRead.model_validate(category) for category in result]
+        cache_categories(user_id, categories)
+        return categories
+
+    @classmethod
+    async def get_user_categories(cls, user_id: UUID | None, db: AsyncSession) -> list[BillCategoryRead]:
+        """All categories owned by `user_id` (globals for None), newest first, through the category cache.
+
+        Entries may lag other workers' writes until CATEGORY_CACHE_TTL passes,
+        unless an invalidation hook is registered. Use this only where a miss
+        is re-checked against the DB (find_usable_ids).
+        """
+        categories = get_cached_categories(user_id)
+        if categories is None:
+            categories = await cls._load_categories(user_id, db)
+        return categories
+
     @classmethod
     async def get_bill_categories(cls, user_id: UUID, db: AsyncSession, skip: int = 0,
-                                  limit: int = 10):
+                                  limit: int = 10, cursor: str | None = None,
+                                  state: tuple[int, datetime | None] | None = None):
+        """A page of a user's categories.
+
+        Given `state` from get_categories_state, the page is cut from the
+        category cache while the cached list still has that state, and the
+        list is reloaded otherwise. That keeps the page correct across
+        workers without any invalidation hook.
+        """
+        if state is None:
+            result = await db.execute(
+                paginate(select(BillCategory).where(BillCategory.user_id == user_id), BillCategory, cursor, skip, limit)
+            )
+            return result.scalars().all()
+
+        categories = get_cached_categories(user_id)
+        if categories is None or cls._state_of(categories) != tuple(state):
+            categories = await cls._load_categories(user_id, db)
+        return paginate_items(categories, cursor, skip, limit)
+
+    @staticmethod
+    def _state_of(categories: list[BillCategoryRead]) -> tuple[int, datetime | None]:
+        return len(categories), max((category.updated_at for category in categories), default=None)
+
+    @classmethod
+    async def get_categories_state(cls, user_id: UUID, db: AsyncSession) -> tuple[int, datetime | None]:
+        """(count, latest updated_at) of a user's categories, without loading them.
+
+        Any create, update or delete changes one of the two. It keys the
+        listing ETag and validates the cached listing.
+        """
         result = await db.execute(
-            select(BillCategory).offset(skip).limit(limit).where(BillCategory.user_id == user_id)
+            select(func.count(), func.max(BillCategory.updated_at)).where(BillCategory.user_id == user_id)
         )
+        return tuple(result.one())
 
-        return result.scalars().all()
+    @classmethod
+    async def find_usable_ids(cls, user_id: UUID, category_ids: Iterable[UUID | None], db: AsyncSession) -> set[UUID]:
+        """Return which of `category_ids` `user_id` may assign: their own or global ones.
+
+        Answered from the cache; ids it doesn't know (e.g. created on another
+        worker) are checked in a single query before being rejected.
+        """
+        wanted = {category_id for category_id in category_ids if category_id}
+        if not wanted:
+            return set()
+        known = {category.id for category in await cls.get_user_categories(user_id, db)}
+        known |= {category.id for category in await cls.get_user_categories(None, db)}
+        usable = wanted & known
+        missing = wanted - usable
+        if missing:
+            found = set(await db.scalars(
+                select(BillCategory.id).where(
+                    BillCategory.id.in_(missing),
+                    or_(BillCategory.user_id == user_id, BillCategory.user_id.is_(None)),
+                )
+            ))
+            if found:
+                # This process's copy is stale; reload it on the next lookup.
+                evict_categories(user_id)
+                evict_categories(None)
+            usable |= found
+        return usable
 
     # Update
     @classmethod
@@ -71,6 +163,7 @@ class BillCategoryCRUD:
 
         await db.commit()
         await db.refresh(db_bill_category)
+        await invalidate_categories(db_bill_category.user_id)
 
         return db_bill_category
 
@@ -82,4 +175,5 @@ class BillCategoryCRUD:
             return False
         await db.delete(db_bill_category)
         await db.commit()
+        await invalidate_categories(db_bill_category.user_id)
         return True
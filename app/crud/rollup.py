@@ -0,0 +1,144 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import Date, cast, delete, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.bill import Bill
+from app.models.bill_monthly_rollup import BillMonthlyRollup
+
+ROLLUP_KEY = ["user_id", "month", "category_id", "currency"]
+
+
+def month_of(moment: datetime) -> date:
+    return moment.date().replace(day=1)
+
+
+class RollupCRUD:
+    """Maintains and reads bill_monthly_rollups."""
+
+    @staticmethod
+    def _add_on_conflict(stmt):
+        return stmt.on_conflict_do_update(
+            index_elements=ROLLUP_KEY,
+            set_={
+                "total": BillMonthlyRollup.total + stmt.excluded.total,
+                "count": BillMonthlyRollup.count + stmt.excluded.count,
+            },
+        )
+
+    @classmethod
+    async def apply_delta(
+            cls,
+            db: AsyncSession,
+            user_id: UUID,
+            category_id: UUID | None,
+            currency: str,
+            created_at: datetime,
+            amount: Decimal,
+            count: int,
+    ) -> None:
+        """Add (amount, count) to one rollup row; call inside the bill write's transaction."""
+        month = month_of(created_at)
+        await db.execute(cls._add_on_conflict(insert(BillMonthlyRollup).values(
+            user_id=user_id,
+            month=month,
+            category_id=category_id,
+            currency=currency,
+            total=amount,
+            count=count,
+        )))
+        if count < 0:
+            await db.execute(
+                delete(BillMonthlyRollup).where(
+                    BillMonthlyRollup.user_id == user_id,
+                    BillMonthlyRollup.month == month,
+                    BillMonthlyRollup.category_id.is_not_distinct_from(category_id),
+                    BillMonthlyRollup.currency == currency,
+                    BillMonthlyRollup.count <= 0,
+                )
+            )
+
+    @classmethod
+    async def apply_query(cls, db: AsyncSession, aggregate) -> None:
+        """Upsert the rows of a SELECT producing (user_id, month, category_id, currency, total, count)."""
+        await db.execute(cls._add_on_conflict(
+            insert(BillMonthlyRollup).from_select(ROLLUP_KEY + ["total", "count"], aggregate)
+        ))
+
+    @staticmethod
+    async def apply_import_staging(db: AsyncSession) -> None:
+        """Add the accepted rows of bill_import_staging (see BillCRUD.import_bills)."""
+        await db.execute(text(
+            "INSERT INTO bill_monthly_rollups (user_id, month, category_id, currency, total, count)"
+            " SELECT s.user_id, date_trunc('month', COALESCE(s.created_at, now()))::date,"
+            " s.category_id, s.currency, sum(s.amount), count(*)"
+            " FROM bill_import_staging s"
+            " WHERE s.category_id IS NULL"
+            " OR EXISTS (SELECT 1 FROM bill_categories c WHERE c.id = s.category_id)"
+            " GROUP BY 1, 2, 3, 4"
+            " ON CONFLICT (user_id, month, category_id, currency) DO UPDATE"
+            " SET total = bill_monthly_rollups.total + excluded.total,"
+            " count = bill_monthly_rollups.count + excluded.count"
+        ))
+
+    @staticmethod
+    def aggregate_bills(user_ids: Sequence[UUID]):
+        month = cast(func.date_trunc("month", Bill.created_at), Date)
+        return (
+            select(
+                Bill.user_id, month, Bill.category_id, Bill.currency,
+                func.sum(Bill.amount), func.count(),
+            )
+            .where(Bill.user_id.in_(user_ids), Bill.is_deleted == False)
+            .group_by(Bill.user_id, month, Bill.category_id, Bill.currency)
+        )
+
+    @classmethod
+    async def rebuild_users(cls, db: AsyncSession, user_ids: Sequence[UUID]) -> None:
+        """Regenerate the rollups of `user_ids` from bills in one transaction."""
+        await db.execute(delete(BillMonthlyRollup).where(BillMonthlyRollup.user_id.in_(user_ids)))
+        await cls.apply_query(db, cls.aggregate_bills(user_ids))
+        await db.commit()
+
+    @classmethod
+    async def get_month_currency_totals(
+            cls,
+            db: AsyncSession,
+            user_id: UUID,
+            month_from: date | None = None,
+            month_to: date | None = None,
+    ) -> list[tuple[date, str, Decimal]]:
+        """(month, currency, total) for a user, summed over categories."""
+        query = (
+            select(BillMonthlyRollup.month, BillMonthlyRollup.currency, func.sum(BillMonthlyRollup.total))
+            .where(BillMonthlyRollup.user_id == user_id)
+            .group_by(BillMonthlyRollup.month, BillMonthlyRollup.currency)
+            .order_by(BillMonthlyRollup.month)
+        )
+        if month_from:
+            query = query.where(BillMonthlyRollup.month >= month_from.replace(day=1))
+        if month_to:
+            query = query.where(BillMonthlyRollup.month <= month_to)
+        result = await db.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    @classmethod
+    async def get_monthly(
+            cls,
+            db: AsyncSession,
+            user_id: UUID,
+            month_from: date | None = None,
+            month_to: date | None = None,
+    ) -> list[BillMonthlyRollup]:
+        query = select(BillMonthlyRollup).where(BillMonthlyRollup.user_id == user_id)
+        if month_from:
+            query = query.where(BillMonthlyRollup.month >= month_from.replace(day=1))
+        if month_to:
+            query = query.where(BillMonthlyRollup.month <= month_to)
+        result = await db.scalars(query.order_by(BillMonthlyRollup.month, BillMonthlyRollup.currency))
+        return result.all()
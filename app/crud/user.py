@@ -1,13 +1,17 @@
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import insert
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import HTTP_404_NOT_FOUND
 
-from app.core.aws_s3 import delete_file_from_s3_async
-from app.core.security import get_password_hash
+from app.core.category_cache import invalidate_categories
+from app.core.pagination import paginate
+from app.core.security import get_password_hash_async
+from app.core.user_cache import invalidate_user
 from app.models.bill import Bill
+from app.models.s3_delete_outbox import S3DeleteOutbox
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -20,7 +24,7 @@ class UserCRUD:
     async def create_user(cls, user: UserCreate, db: AsyncSession) -> User:
         user_data = user.model_dump()
         if "password_hash" in user_data:
-            user_data["password_hash"] = get_password_hash(user_data.pop("password_hash"))
+            user_data["password_hash"] = await get_password_hash_async(user_data.pop("password_hash"))
         db_user = User(**user_data)
         db.add(db_user)
         await db.commit()
@@ -38,8 +42,8 @@ class UserCRUD:
 
     # Read many
     @classmethod
-    async def get_users(cls, db: AsyncSession, skip: int = 0, limit: int = 10):
-        result = await db.execute(select(User).offset(skip).limit(limit))
+    async def get_users(cls, db: AsyncSession, skip: int = 0, limit: int = 10, cursor: str | None = None):
+        result = await db.execute(paginate(select(User), User, cursor, skip, limit))
         return result.scalars().all()
 
     # Update
@@ -52,36 +56,34 @@ class UserCRUD:
 
         update_data = user.model_dump(exclude_unset=True)
         if "password_hash" in update_data:
-            update_data["password_hash"] = get_password_hash(update_data.pop("password_hash"))
+            update_data["password_hash"] = await get_password_hash_async(update_data.pop("password_hash"))
 
         for key, value in update_data.items():
             setattr(db_user, key, value)
 
         await db.commit()
         await db.refresh(db_user)
+        await invalidate_user(user_id)
         return db_user
 
         # Delete (soft delete optional)
 
     @classmethod
     async def delete_user(cls, user_id: UUID, db: AsyncSession) -> bool:
-        """Delete user and all related S3 files"""
+        """Delete user and queue all related S3 files for cleanup"""
         user = await cls.get_user(user_id=user_id, db=db)
         if not user:
             return False
 
-        result = await db.execute(select(Bill.bill_image_url).where(Bill.user_id == user_id))
-        bill_urls = []
-        for url in result.scalars().all():
-            if url:
-                bill_urls.append(url)
-
-        for url in bill_urls:
-            try:
-                await delete_file_from_s3_async(url)
-            except Exception as e:
-                print(f"⚠️ Error deleting S3 file {url}: {e}")
+        await db.execute(
+            insert(S3DeleteOutbox).from_select(
+                ["object_key"],
+                select(Bill.bill_image_url).where(Bill.user_id == user_id, Bill.bill_image_url.is_not(None)),
+            )
+        )
 
         await db.delete(user)
         await db.commit()
+        await invalidate_user(user_id)
+        await invalidate_categories(user_id)
         return True
@@ -1,6 +1,8 @@
+import time
 from typing import AsyncGenerator
+from uuid import UUID
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
@@ -8,32 +10,49 @@ from sqlmodel import select
 
 from app.core.database import sessionmanager
 from app.core.security import SECRET_KEY, ALGORITHM
+from app.core.user_cache import cache_user, get_cached_user
 from app.models.user import User
+from app.schemas.user import UserRead
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Set by the write-tracking middleware in app.main after a successful write.
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async for session in sessionmanager.get_session():
         yield session
 
 
-async def get_current_user(
-        token: str = Depends(oauth2_scheme),
-        db: AsyncSession = Depends(get_db)
-) -> User:
-    """Extract user from JWT and fetch from DB"""
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints; pinned to the primary right after a client writes."""
+    try:
+        pinned = float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        pinned = False
+    async for session in sessionmanager.get_session(read_only=not pinned):
+        yield session
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserRead:
+    """Extract user from JWT; served from the user cache, falling back to the DB"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
+        user_id = UUID(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    principal = get_cached_user(user_id)
+    if principal:
+        return principal
+
+    async for db in get_db():
         result = await db.execute(select(User).where(User.id == user_id))
         user = result.scalar_one_or_none()
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
+        principal = UserRead.model_validate(user) if user else None
 
-        return user
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if not principal:
+        raise HTTPException(status_code=401, detail="User not found")
+    cache_user(principal)
+    return principal
@@ -1,15 +1,40 @@
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 
 from app.api.v1 import api_router
+from app.core.aws_s3 import s3_manager
+from app.core.config import settings
 from app.core.database import sessionmanager
+from app.core.fx import fx_rates
+from app.deps import PRIMARY_PIN_COOKIE
+from services.bill_purge import bill_purge_job
+from services.partitions import partition_maintainer
+from services.recurring import recurring_scheduler
+from services.s3_cleanup import s3_cleanup_worker
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     sessionmanager.init_db()
+    await sessionmanager.warm_up()
+    if settings.POSTGRES_POOL_ADAPTIVE:
+        sessionmanager.start_adaptive_sizing()
+    sessionmanager.start_replica_health_checks()
+    await s3_manager.init_client()
+    s3_cleanup_worker.start()
+    fx_rates.start()
+    partition_maintainer.start()
+    recurring_scheduler.start()
+    bill_purge_job.start()
     yield
+    await bill_purge_job.stop()
+    await recurring_scheduler.stop()
+    await partition_maintainer.stop()
+    await fx_rates.stop()
+    await s3_cleanup_worker.stop()
+    await s3_manager.close()
     await sessionmanager.close()
 
 
@@ -23,3 +48,20 @@ app = FastAPI(
 )
 
 app.include_router(api_router)
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    """After a successful write, route this client's reads to the primary for a short window."""
+    response = await call_next(request)
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    if request.method not in READ_METHODS and response.status_code < 400 and window > 0:
+        response.set_cookie(
+            PRIMARY_PIN_COOKIE,
+            str(time.time() + window),
+            max_age=int(window) + 1,
+            httponly=True,
+        )
+    return response
@@ -2,7 +2,7 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime, event
+from sqlalchemy import Column, DateTime, Index, event, literal_column, text
 from sqlalchemy.dialects.postgresql import UUID as pgUUID
 from sqlmodel import Field, SQLModel
 
@@ -11,15 +11,67 @@ class Bill(SQLModel, table=True):
     """
     Bill model.
     Stores information about user bills / recurring payments.
+
+    The table also has a generated `search_vector` tsvector column (see
+    migration 7b90c3e1d4f2). It is left unmapped so the ORM never tries to
+    write it; queries reference it through SEARCH_VECTOR.
+
+    The table is range-partitioned by month on created_at (migration
+    c58f2a7e9b01). Queries should bound created_at where they can so the
+    planner prunes partitions; a lookup by id alone probes every partition.
     """
     __tablename__ = "bills"
+    __table_args__ = (
+        Index("ix_bills_created_at_id", "created_at", "id"),
+        # Serves "a user's live bills, newest first" (scanned backwards).
+        Index(
+            "ix_bills_user_id_created_at_active",
+            "user_id", "created_at", "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        Index(
+            "ix_bills_user_id_category_id_created_at_active",
+            "user_id", "category_id", "created_at", "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        Index(
+            "ix_bills_user_id_currency_created_at_active",
+            "user_id", "currency", "created_at", "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        Index(
+            "ix_bills_user_id_amount_active",
+            "user_id", "amount",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        # Typo-tolerant title search scoped to one user (needs pg_trgm and btree_gin).
+        Index(
+            "ix_bills_user_id_title_trgm",
+            "user_id", "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        # Only recurring templates have next_due_at, so the scheduler's scan stays small.
+        Index(
+            "ix_bills_next_due_at",
+            "next_due_at",
+            postgresql_where=text("next_due_at IS NOT NULL AND NOT is_deleted"),
+        ),
+        # Lets the purge job walk soft-deleted rows without touching live ones.
+        Index(
+            "ix_bills_created_at_id_deleted",
+            "created_at", "id",
+            postgresql_where=text("is_deleted"),
+        ),
+        # Monthly partitions are created by ensure_monthly_partitions() (see services/partitions.py).
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: UUID = Field(default_factory=uuid4,
                      sa_column=Column(
                          pgUUID(as_uuid=True),
                          primary_key=True,
-                         index=True,
-                         unique=True
                      ))
     user_id: UUID = Field(
         foreign_key="users.id",
@@ -53,29 +105,45 @@ class Bill(SQLModel, table=True):
         default=None,
         description="Link to bill image (e.g. S3 storage)",
     )
+    recurrence: str | None = Field(
+        default=None,
+        max_length=10,
+        description="Recurrence rule: daily, weekly, monthly or yearly",
+    )
+    recurrence_interval: int = Field(
+        default=1,
+        nullable=False,
+        sa_column_kwargs={"server_default": "1"},
+        description="Repeat every N periods",
+    )
+    recurrence_end_at: datetime | None = Field(
+        default=None,
+        description="No occurrences are created after this time",
+    )
+    next_due_at: datetime | None = Field(
+        default=None,
+        description="When the next occurrence is due (NULL if not recurring)",
+    )
     is_deleted: bool = Field(
         default=False,
         nullable=False,
         description="Soft delete flag",
     )
+    # Part of the primary key because it is the partition key.
     created_at: datetime = Field(
-        sa_column=Column(DateTime, default=datetime.now(), nullable=False),
+        sa_column=Column(DateTime, primary_key=True, default=datetime.now, nullable=False),
         description="Creation timestamp (UTC)",
     )
     updated_at: datetime = Field(
-        sa_column=Column(DateTime, default=datetime.now(), nullable=False),
+        sa_column=Column(DateTime, default=datetime.now, nullable=False),
         description="Last update timestamp (UTC)",
     )
 
 
+SEARCH_VECTOR = literal_column("bills.search_vector")
+
+
 @event.listens_for(Bill, "before_update", propagate=True)
 def set_updated_at(mapper, connection, target) -> None:
     target.updated_at = datetime.now()
 
-
-@event.listens_for(Bill, "before_delete")
-async def delete_bill_image(mapper, connection, target):
-    """Delete bill image from S3 after DB delete"""
-    if target.bill_image_url:
-        from app.core.aws_s3 import delete_file_from_s3
-        delete_file_from_s3(target.bill_image_url)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime, event
+from sqlalchemy import Column, DateTime, Index, event
 from sqlalchemy.dialects.postgresql import UUID as pgUUID
 from sqlmodel import SQLModel, Field
 
@@ -12,21 +12,27 @@ class BillCategory(SQLModel, table=True):
     Stores categories for bills (default or user-defined).
     """
     __tablename__ = 'bill_categories'
+    __table_args__ = (
+        Index("ix_bill_categories_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index(
+            "ix_bill_categories_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: UUID = Field(
         default_factory=uuid4,
         sa_column=Column(
             pgUUID(as_uuid=True),
             primary_key=True,
-            index=True,
-            unique=True,
             nullable=False,
         ),
     )
     name: str = Field(
         max_length=100,
         nullable=False,
-        index=True,
         description="Category name (e.g. Food, Subscriptions, Utilities)",
     )
     icon_url: str | None = Field(
@@ -41,11 +47,11 @@ class BillCategory(SQLModel, table=True):
         description="FK → User.id (if custom user-defined category)",
     )
     created_at: datetime = Field(
-        sa_column=Column(DateTime, default=datetime.now(), nullable=False),
+        sa_column=Column(DateTime, default=datetime.now, nullable=False),
         description="Creation timestamp (UTC)",
     )
     updated_at: datetime = Field(
-        sa_column=Column(DateTime, default=datetime.now(), nullable=False),
+        sa_column=Column(DateTime, default=datetime.now, nullable=False),
         description="Last update timestamp (UTC)",
     )
 
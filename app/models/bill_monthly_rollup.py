@@ -0,0 +1,53 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import Column, Date, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class BillMonthlyRollup(SQLModel, table=True):
+    """
+    BillMonthlyRollup model.
+    Per user, category, currency and month totals of live bills,
+    maintained by BillCRUD in the same transaction as each bill write.
+    """
+    __tablename__ = "bill_monthly_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "month", "category_id", "currency",
+            name="uq_bill_monthly_rollups_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: UUID = Field(
+        foreign_key="users.id",
+        ondelete="CASCADE",
+        nullable=False,
+        description="FK → User.id",
+    )
+    category_id: UUID | None = Field(
+        default=None,
+        description="BillCategory.id (NULL for uncategorized bills)",
+    )
+    currency: str = Field(
+        max_length=3,
+        nullable=False,
+        description="Currency (ISO 4217)",
+    )
+    month: date = Field(
+        sa_column=Column(Date, nullable=False),
+        description="First day of the month",
+    )
+    total: Decimal = Field(
+        default=0,
+        nullable=False,
+        description="Sum of bill amounts",
+    )
+    count: int = Field(
+        default=0,
+        nullable=False,
+        description="Number of bills",
+    )
@@ -0,0 +1,27 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Column, Date
+from sqlmodel import Field, SQLModel
+
+
+class FxRate(SQLModel, table=True):
+    """
+    FxRate model.
+    Daily exchange rates, stored as units of FX_BASE_CURRENCY per one unit of `currency`.
+    """
+    __tablename__ = "fx_rates"
+
+    currency: str = Field(
+        primary_key=True,
+        max_length=3,
+        description="Currency (ISO 4217)",
+    )
+    rate_date: date = Field(
+        sa_column=Column(Date, primary_key=True, nullable=False),
+        description="Date the rate applies from",
+    )
+    rate: Decimal = Field(
+        nullable=False,
+        description="Units of the base currency per one unit of `currency`",
+    )
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, func
+from sqlmodel import Field, SQLModel
+
+
+class S3DeleteOutbox(SQLModel, table=True):
+    """
+    S3DeleteOutbox model.
+    S3 objects waiting to be deleted, written in the same transaction
+    as the row that referenced them and drained by S3CleanupWorker.
+    """
+    __tablename__ = "s3_delete_outbox"
+
+    id: int | None = Field(default=None, primary_key=True)
+    object_key: str = Field(
+        nullable=False,
+        index=True,
+        description="S3 key (or URL) of the object to delete",
+    )
+    attempts: int = Field(
+        default=0,
+        nullable=False,
+        sa_column_kwargs={"server_default": "0"},
+        description="Failed delete attempts so far",
+    )
+    last_error: str | None = Field(
+        default=None,
+        description="Error from the last failed attempt",
+    )
+    next_attempt_at: datetime = Field(
+        sa_column=Column(DateTime, server_default=func.now(), nullable=False, index=True),
+        description="Earliest time the worker may retry this row",
+    )
+    created_at: datetime = Field(
+        sa_column=Column(DateTime, server_default=func.now(), nullable=False),
+        description="Creation timestamp",
+    )
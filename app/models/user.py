@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Index
 from sqlalchemy import event
 from sqlalchemy.dialects.postgresql import UUID as pgUUID
 from sqlmodel import SQLModel, Field
@@ -14,14 +14,13 @@ class User(SQLModel, table=True):
     """
 
     __tablename__ = 'users'
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     id: UUID = Field(
         default_factory=uuid4,
         sa_column=Column(
             pgUUID(as_uuid=True),
             primary_key=True,
-            index=True,
-            unique=True,
             nullable=False,
         ),
     )
@@ -39,17 +38,28 @@ class User(SQLModel, table=True):
         unique=True,
         description="User email (optional, must be unique if provided)",
     )
+    preferred_currency: str | None = Field(
+        default=None,
+        max_length=3,
+        description="Currency reports are converted to (ISO 4217)",
+    )
+    bills_version: int = Field(
+        default=0,
+        nullable=False,
+        sa_column_kwargs={"server_default": "0"},
+        description="Bumped with every write to the user's bills (see app/core/versions.py)",
+    )
     password_hash: str = Field(
         nullable=False,
         max_length=255,
         description="Hashed user password",
     )
     created_at: datetime = Field(
-        sa_column=Column(DateTime, default=datetime.now(), nullable=False),
+        sa_column=Column(DateTime, default=datetime.now, nullable=False),
         description="User creation timestamp (UTC)",
     )
     updated_at: datetime = Field(
-        sa_column=Column(DateTime, default=datetime.now(), nullable=False),
+        sa_column=Column(DateTime, default=datetime.now, nullable=False),
         description="Last update timestamp (UTC)",
     )
 
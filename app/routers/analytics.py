@@ -0,0 +1,81 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.fx import fx_rates
+from app.crud.analytics import AnalyticsCRUD
+from app.crud.rollup import RollupCRUD
+from app.deps import get_read_db, get_current_user
+from app.schemas.analytics import (
+    ConvertedTotal,
+    MonthlyRollupRead,
+    SpendingDimension,
+    SpendingReport,
+    TimeBucket,
+)
+from app.schemas.user import UserRead
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/spending", response_model=SpendingReport, status_code=status.HTTP_200_OK)
+async def read_spending(
+        group_by: list[SpendingDimension] = Query([SpendingDimension.currency]),
+        bucket: TimeBucket | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: UserRead = Depends(get_current_user),
+):
+    groups = await AnalyticsCRUD.get_spending(db, current_user.id, group_by, bucket, date_from, date_to)
+    return {"groups": groups}
+
+
+@router.get("/monthly", response_model=list[MonthlyRollupRead], status_code=status.HTTP_200_OK)
+async def read_monthly_totals(
+        month_from: date | None = None,
+        month_to: date | None = None,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: UserRead = Depends(get_current_user),
+):
+    """Per month, category and currency totals from the precomputed rollup table."""
+    return await RollupCRUD.get_monthly(db, current_user.id, month_from, month_to)
+
+
+def _rate_date(month: date) -> date:
+    """Convert a month's total at the rate of its last day (or today for the current month)."""
+    month_end = (month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return min(month_end, date.today())
+
+
+@router.get("/total", response_model=ConvertedTotal, status_code=status.HTTP_200_OK)
+async def read_converted_total(
+        currency: str | None = None,
+        month_from: date | None = None,
+        month_to: date | None = None,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: UserRead = Depends(get_current_user),
+):
+    """Total spending across all currencies, converted to `currency` or the user's preferred one.
+
+    Conversion is applied once per (month, currency) rollup group, never per bill.
+    """
+    target = (currency or current_user.preferred_currency or settings.FX_BASE_CURRENCY).upper()
+    rows = await RollupCRUD.get_month_currency_totals(db, current_user.id, month_from, month_to)
+
+    months: dict[date, Decimal] = {}
+    try:
+        for month, source, total in rows:
+            converted = fx_rates.convert(total, source, target, _rate_date(month))
+            months[month] = months.get(month, Decimal(0)) + converted
+    except LookupError as e:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, str(e))
+
+    return {
+        "currency": target,
+        "total": sum(months.values(), Decimal(0)),
+        "months": [{"month": month, "total": total} for month, total in months.items()],
+    }
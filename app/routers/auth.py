@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password_async, rehash_password_async, needs_rehash, create_access_token
 from app.deps import get_db
 from app.models.user import User
 
@@ -13,7 +13,13 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 @router.post("/login")
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     user = await db.scalar(select(User).where(User.username == form_data.username))
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect username or password")
+    if needs_rehash(user.password_hash):
+        # Skipped under load; a correct password must never be answered with a 503.
+        new_hash = await rehash_password_async(form_data.password)
+        if new_hash:
+            user.password_hash = new_hash
+            await db.commit()
     access_token = create_access_token({"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
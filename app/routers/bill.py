@@ -2,14 +2,34 @@ from fastapi import APIRouter, status
 
 router = APIRouter(prefix="/bills", tags=["Bills"])
 
-from uuid import UUID
+import time
+from uuid import UUID, uuid4
+from datetime import datetime
 from decimal import Decimal
-from fastapi import Depends, UploadFile, File, Form
+from fastapi import Depends, UploadFile, File, Form, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.aws_s3 import upload_file_to_s3, generate_presigned_url
+from app.core.aws_s3 import (
+    direct_upload_key,
+    image_key,
+    upload_file_to_s3,
+    generate_presigned_url,
+    generate_presigned_urls,
+    generate_presigned_post,
+    object_exists,
+)
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.etag import conditional_headers, etag_matches, make_etag, not_modified
+from app.core.export import EXPORT_MEDIA_TYPES, check_export_format, export_chunks
+from app.core.pagination import next_cursor
+from app.core.recurrence import Recurrence
+from app.core.streaming import iter_records
 from app.schemas import bill as schemas
+from app.schemas.pagination import Page
+from app.schemas.user import UserRead
 from app.crud.bill import BillCRUD as crud
-from app.deps import get_db
+from app.deps import get_db, get_read_db, get_current_user
 
 
 @router.post("/", response_model=schemas.BillRead)
@@ -19,6 +39,9 @@ async def create_bill(
         currency: str = Form(...),
         user_id: UUID = Form(...),
         category_id: UUID | None = Form(None),
+        recurrence: Recurrence | None = Form(None),
+        recurrence_interval: int = Form(1, ge=1),
+        recurrence_end_at: datetime | None = Form(None),
         file: UploadFile | None = File(None),
         db: AsyncSession = Depends(get_db),
 ):
@@ -28,35 +51,161 @@ async def create_bill(
         currency=currency,
         user_id=user_id,
         category_id=category_id,
+        recurrence=recurrence,
+        recurrence_interval=recurrence_interval,
+        recurrence_end_at=recurrence_end_at,
     )
-    db_bill = await crud.create_bill(db, bill_data)
-
+    bill_id = uuid4()
     if file and file.filename:
-        key = upload_file_to_s3(file, str(db_bill.id))
-        db_bill.bill_image_url = key
-        await db.commit()
-        await db.refresh(db_bill)
+        key = image_key(file, str(bill_id))
+        # Reserved first: if the bill never commits, the cleanup worker deletes the upload.
+        await crud.reserve_image_key(db, key)
+        await upload_file_to_s3(file, str(bill_id))
+        bill_data.bill_image_url = key
+    return await crud.create_bill(db, bill_data, bill_id)
+
+
+@router.post("/import", response_model=schemas.BillImportResult)
+async def import_bills(
+        request: Request,
+        format: str = "csv",
+        db: AsyncSession = Depends(get_db),
+        current_user: UserRead = Depends(get_current_user),
+):
+    """Bulk-import the current user's bills from a streamed CSV or NDJSON body."""
+    records = iter_records(request.stream(), format)
+    return await crud.import_bills(db, current_user.id, records)
 
-    return db_bill
+
+@router.post("/{bill_id}/image/upload-url", response_model=schemas.BillImageUpload)
+async def create_bill_image_upload(
+        bill_id: UUID,
+        data: schemas.BillImageUploadRequest,
+        db: AsyncSession = Depends(get_db),
+        current_user: UserRead = Depends(get_current_user),
+):
+    """Return a presigned POST for uploading the bill image directly to S3."""
+    if not data.content_type.startswith("image/"):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Only image uploads are allowed")
+
+    bill = await crud.get_bill(bill_id, db, current_user.id)
+    key = direct_upload_key(data.filename, str(bill.id))
+    # Deleted by the cleanup worker unless confirmed within S3_ORPHAN_GRACE_SECONDS.
+    await crud.reserve_image_key(db, key)
+    post = await generate_presigned_post(key, data.content_type)
+    return schemas.BillImageUpload(
+        key=key,
+        url=post["url"],
+        fields=post["fields"],
+        expires_in=settings.S3_PRESIGNED_POST_EXPIRES,
+    )
+
+
+@router.post("/{bill_id}/image/confirm", response_model=schemas.BillRead)
+async def confirm_bill_image_upload(
+        bill_id: UUID,
+        data: schemas.BillImageConfirm,
+        db: AsyncSession = Depends(get_db),
+        current_user: UserRead = Depends(get_current_user),
+):
+    """Attach an image uploaded through the presigned POST to the bill."""
+    if not data.key.startswith(f"bills/{bill_id}/"):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Key does not belong to this bill")
+    await crud.get_bill(bill_id, db, current_user.id)
+    if not await object_exists(data.key):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Image has not been uploaded")
+    return await crud.set_bill_image(bill_id, data.key, db, current_user.id)
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_bills(
+        format: str = "csv",
+        gzip: bool = False,
+        current_user: UserRead = Depends(get_current_user),
+):
+    """Stream all of the current user's bills as CSV, NDJSON or Parquet."""
+    check_export_format(format)
+
+    async def body():
+        # The session lives inside the generator so the cursor stays open while streaming.
+        async for db in sessionmanager.get_session(read_only=True):
+            async for chunk in export_chunks(crud.export_columns(), crud.stream_bills(db, current_user.id), format, gzip):
+                yield chunk
+
+    filename = f"bills.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        body(),
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/search", response_model=list[schemas.BillRead], status_code=status.HTTP_200_OK)
+async def search_bills(
+        q: str,
+        limit: int = Query(20, ge=1, le=100),
+        db: AsyncSession = Depends(get_read_db),
+        current_user: UserRead = Depends(get_current_user),
+):
+    """Full-text and fuzzy search over the current user's bill titles and category names."""
+    bills = await crud.search_bills(db, current_user.id, q, limit)
+    urls = generate_presigned_urls(bill.bill_image_url for bill in bills if bill.bill_image_url)
+    for bill in bills:
+        if bill.bill_image_url:
+            bill.bill_image_url = urls[bill.bill_image_url]
+    return bills
 
 
 @router.get("/{bill_id}", response_model=schemas.BillRead, status_code=status.HTTP_200_OK)
-async def read_bill(bill_id: UUID, db: AsyncSession = Depends(get_db)):
+async def read_bill(bill_id: UUID, db: AsyncSession = Depends(get_read_db)):
     bill = await crud.get_bill(bill_id, db)
     if bill.bill_image_url:
         bill.bill_image_url = generate_presigned_url(bill.bill_image_url)
     return bill
 
 
-@router.get("/", response_model=list[schemas.BillRead], status_code=status.HTTP_200_OK)
-async def read_bills(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
-    bills = await crud.get_bills(db, skip=skip, limit=limit)
-
+@router.get("/", response_model=Page[schemas.BillRead], status_code=status.HTTP_200_OK)
+async def read_bills(
+        request: Request,
+        response: Response,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: str | None = None,
+        filters: schemas.BillFilter = Depends(),
+        db: AsyncSession = Depends(get_read_db),
+        current_user: UserRead = Depends(get_current_user),
+):
+    page = dict(skip=skip, limit=limit, cursor=cursor, filters=filters)
+    if request.headers.get("if-none-match"):
+        # Polls are answered from (id, updated_at) of the page alone.
+        etag = _bills_etag(await crud.get_bills_page_state(db, current_user.id, **page))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    bills = await crud.get_bills(db, current_user.id, **page)
+    cursor_after = next_cursor(bills, limit)
+    response.headers.update(conditional_headers(
+        _bills_etag([(bill.id, bill.updated_at, bill.bill_image_url is not None) for bill in bills])
+    ))
+
+    urls = generate_presigned_urls(bill.bill_image_url for bill in bills if bill.bill_image_url)
     for bill in bills:
         if bill.bill_image_url:
-            bill.bill_image_url = generate_presigned_url(bill.bill_image_url)
+            bill.bill_image_url = urls[bill.bill_image_url]
 
-    return bills
+    return {"items": bills, "next_cursor": cursor_after}
+
+
+def _bills_etag(page_state: list[tuple]) -> str:
+    """ETag for a page of bills given (id, updated_at, has_image) per bill.
+
+    Pages with images also change every PRESIGNED_URL_CACHE_MARGIN seconds,
+    so a client revalidating a cached body never keeps an expired image URL.
+    """
+    parts = [f"{bill_id}:{updated_at.isoformat()}" for bill_id, updated_at, _ in page_state]
+    if any(has_image for _, _, has_image in page_state):
+        parts.append(int(time.time() // max(settings.PRESIGNED_URL_CACHE_MARGIN, 1)))
+    return make_etag(parts)
 
 
 @router.put("/{bill_id}", response_model=schemas.BillRead)
@@ -78,10 +227,8 @@ async def update_bill(
     db_bill = await crud.update_bill(bill_id, update_data, db)
 
     if file and file.filename:
-        key = upload_file_to_s3(file, str(bill_id))
-        db_bill.bill_image_url = key
-        await db.commit()
-        await db.refresh(db_bill)
+        key = await upload_file_to_s3(file, str(bill_id))
+        db_bill = await crud.set_bill_image(bill_id, key, db)
 
     return db_bill
 
@@ -1,15 +1,18 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.etag import conditional_headers, etag_matches, make_etag, not_modified
+from app.core.pagination import next_cursor
 from app.crud.bill_category import BillCategoryCRUD
-from app.deps import get_db
+from app.deps import get_db, get_read_db
 from app.schemas.bill_category import (
     BillCategoryCreate,
     BillCategoryUpdate,
     BillCategoryRead
 )
+from app.schemas.pagination import Page
 
 router = APIRouter(prefix="/bill-categories", tags=["Bill Categories"])
 
@@ -24,19 +27,31 @@ async def create_bill_category(
     return category
 
 
-@router.get("/", response_model=list[BillCategoryRead], status_code=status.HTTP_200_OK)
+@router.get("/", response_model=Page[BillCategoryRead], status_code=status.HTTP_200_OK)
 async def read_bill_categories(
+        request: Request,
+        response: Response,
         user_id: UUID,
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        cursor: str | None = None,
 ):
-    categories = await BillCategoryCRUD.get_bill_categories(user_id, db, skip, limit)
-    return categories
+    # One aggregate over the user's categories answers polls and validates the
+    # cached list, so a write on any worker is seen on the next request.
+    state = await BillCategoryCRUD.get_categories_state(user_id, db)
+    count, updated_at = state
+    etag = make_etag([count, updated_at and updated_at.isoformat(), skip, limit, cursor])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    categories = await BillCategoryCRUD.get_bill_categories(user_id, db, skip, limit, cursor, state)
+    response.headers.update(conditional_headers(etag))
+    return {"items": categories, "next_cursor": next_cursor(categories, limit)}
 
 
 @router.get("/{category_id}", response_model=BillCategoryRead, status_code=status.HTTP_200_OK)
-async def read_bill_category(category_id: UUID, db: AsyncSession = Depends(get_db)):
+async def read_bill_category(category_id: UUID, db: AsyncSession = Depends(get_read_db)):
     category = await BillCategoryCRUD.get_bill_category(category_id, db)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, status
+
+from app.core.metrics import collect
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/", status_code=status.HTTP_200_OK)
+async def read_metrics():
+    return collect()
@@ -1,19 +1,25 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.etag import conditional_headers, etag_matches, make_etag, not_modified
+from app.core.pagination import next_cursor
 from app.crud.user import UserCRUD
-from app.deps import get_db, get_current_user
-from app.models.user import User
+from app.deps import get_db, get_read_db, get_current_user
+from app.schemas.pagination import Page
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserRead)
-async def get_me(current_user: User = Depends(get_current_user)):
-    return UserRead.model_validate(current_user)
+async def get_me(request: Request, response: Response, current_user: UserRead = Depends(get_current_user)):
+    etag = make_etag([current_user.model_dump_json()])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(conditional_headers(etag))
+    return current_user
 
 
 # Create user
@@ -23,14 +29,15 @@ async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
 
 
 # Get all users
-@router.get("/", response_model=list[UserRead])
-async def get_users(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
-    return await UserCRUD.get_users(db=db, skip=skip, limit=limit)
+@router.get("/", response_model=Page[UserRead])
+async def get_users(skip: int = 0, limit: int = 10, cursor: str | None = None, db: AsyncSession = Depends(get_read_db)):
+    users = await UserCRUD.get_users(db=db, skip=skip, limit=limit, cursor=cursor)
+    return {"items": users, "next_cursor": next_cursor(users, limit)}
 
 
 # Get one user
 @router.get("/{user_id}", response_model=UserRead)
-async def get_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_user(user_id: UUID, db: AsyncSession = Depends(get_read_db)):
     return await UserCRUD.get_user(user_id=user_id, db=db)
 
 
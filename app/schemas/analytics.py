@@ -0,0 +1,54 @@
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SpendingDimension(str, Enum):
+    category = "category"
+    currency = "currency"
+
+
+class TimeBucket(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class SpendingGroup(BaseModel):
+    category_id: UUID | None = None
+    currency: str | None = None
+    bucket: datetime | None = None
+    total: Decimal
+    count: int
+    average: Decimal
+    p50: float
+    p90: float
+
+
+class SpendingReport(BaseModel):
+    groups: list[SpendingGroup]
+
+
+class ConvertedMonthTotal(BaseModel):
+    month: date
+    total: Decimal
+
+
+class ConvertedTotal(BaseModel):
+    currency: str
+    total: Decimal
+    months: list[ConvertedMonthTotal]
+
+
+class MonthlyRollupRead(BaseModel):
+    month: date
+    category_id: UUID | None
+    currency: str
+    total: Decimal
+    count: int
+
+    class Config:
+        from_attributes = True
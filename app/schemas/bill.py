@@ -3,7 +3,10 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+
+from app.core.partitions import partition_horizon
+from app.core.recurrence import Recurrence
 
 
 class BillBase(BaseModel):
@@ -16,17 +19,77 @@ class BillBase(BaseModel):
 class BillCreate(BillBase):
     user_id: UUID
     category_id: UUID | None = None
+    recurrence: Recurrence | None = None
+    recurrence_interval: int = Field(default=1, ge=1)
+    recurrence_end_at: datetime | None = None
+
+
+class BillImportRow(BillCreate):
+    created_at: datetime | None = None
+
+    @field_validator("created_at")
+    @classmethod
+    def within_partition_horizon(cls, value: datetime | None) -> datetime | None:
+        if value is None:
+            return value
+        if value.tzinfo:
+            # bills.created_at is naive local time, like datetime.now() everywhere else.
+            value = value.astimezone().replace(tzinfo=None)
+        earliest, latest = partition_horizon()
+        if not earliest <= value < latest:
+            raise ValueError(f"must be between {earliest:%Y-%m-%d} and {latest:%Y-%m-%d} (exclusive)")
+        return value
+
+
+class BillImportError(BaseModel):
+    row: int
+    error: str
+
+
+class BillImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[BillImportError]
 
 
 class BillUpdate(BillBase):
     category_id: UUID | None
 
 
+class BillFilter(BaseModel):
+    category_id: UUID | None = None
+    currency: str | None = None
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    min_amount: Decimal | None = None
+    max_amount: Decimal | None = None
+
+
+class BillImageUploadRequest(BaseModel):
+    filename: str
+    content_type: str
+
+
+class BillImageUpload(BaseModel):
+    key: str
+    url: str
+    fields: dict[str, str]
+    expires_in: int
+
+
+class BillImageConfirm(BaseModel):
+    key: str
+
+
 class BillRead(BillBase):
     id: UUID
     user_id: UUID
     category_id: UUID | None
     is_deleted: bool
+    recurrence: str | None = None
+    recurrence_interval: int = 1
+    recurrence_end_at: datetime | None = None
+    next_due_at: datetime | None = None
     created_at: datetime
     updated_at: datetime
 
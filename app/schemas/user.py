@@ -7,6 +7,7 @@ from pydantic import BaseModel
 class UserBase(BaseModel):
     username: str
     email: str | None = None
+    preferred_currency: str | None = None
 
 
 class UserCreate(UserBase):
@@ -16,6 +17,7 @@ class UserCreate(UserBase):
 class UserUpdate(BaseModel):
     username: str | None = None
     email: str | None = None
+    preferred_currency: str | None = None
     password_hash: str | None = None
 
 
@@ -0,0 +1,204 @@
+"""Hard-delete soft-deleted bills past the retention window.
+
+Usage: python -m services.bill_purge [--retention-days N] [--batch-size N]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, text, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.metrics import register_collector
+from app.core.periodic import PeriodicTask
+from app.models.bill import Bill
+from app.models.s3_delete_outbox import S3DeleteOutbox
+
+logger = logging.getLogger(__name__)
+
+REPLICATION_LAG_QUERY = text(
+    "SELECT count(*), COALESCE(max(EXTRACT(EPOCH FROM replay_lag)), 0) FROM pg_stat_replication"
+)
+# Without pg_monitor, pg_stat_replication hides its rows and the lag check would pass silently.
+LAG_VISIBLE_QUERY = text("SELECT pg_has_role('pg_monitor', 'USAGE')")
+LOCK_WAITERS_QUERY = text(
+    "SELECT count(*) FROM pg_stat_activity"
+    " WHERE wait_event_type = 'Lock' AND datname = current_database()"
+)
+
+
+class BillPurgeJob(PeriodicTask):
+    """Removes soft-deleted bills whose deletion is older than the retention window.
+
+    Rows are walked in (created_at, id) order through a partial index on
+    deleted rows and removed in small DELETE ... RETURNING chunks; returned
+    image keys go to s3_delete_outbox in the same transaction. Before each
+    chunk the job backs off while replicas lag or sessions queue on locks.
+    """
+
+    name = "Bill purge"
+
+    def __init__(
+            self,
+            retention: timedelta = timedelta(days=settings.BILL_PURGE_RETENTION_DAYS),
+            batch_size: int = settings.BILL_PURGE_BATCH_SIZE,
+            interval: float = settings.BILL_PURGE_INTERVAL,
+            chunk_pause: float = settings.BILL_PURGE_CHUNK_PAUSE,
+            max_replication_lag: float = settings.BILL_PURGE_MAX_REPLICATION_LAG,
+            max_lock_waiters: int = settings.BILL_PURGE_MAX_LOCK_WAITERS,
+            throttle_sleep: float = settings.BILL_PURGE_THROTTLE_SLEEP,
+    ) -> None:
+        super().__init__(interval)
+        self.retention = retention
+        self.batch_size = batch_size
+        self.chunk_pause = chunk_pause
+        self.max_replication_lag = max_replication_lag
+        self.max_lock_waiters = max_lock_waiters
+        self.throttle_sleep = throttle_sleep
+        self.purged_total = 0
+        self.throttled_total = 0
+        self.last_run: dict = {}
+        self.lag_visible: bool | None = None
+
+    async def run_once(self) -> None:
+        await self.purge()
+
+    def snapshot(self) -> dict:
+        return {
+            "purged_total": self.purged_total,
+            "throttled_total": self.throttled_total,
+            "replication_lag_visible": self.lag_visible,
+            "last_run": self.last_run,
+        }
+
+    async def purge(self) -> int:
+        """Purge every eligible bill; return how many rows were deleted."""
+        cutoff = datetime.now() - self.retention
+        started = time.monotonic()
+        purged = 0
+        position = None
+        while True:
+            await self._wait_for_headroom()
+            deleted, position = await self._purge_chunk(cutoff, position)
+            purged += deleted
+            self.purged_total += deleted
+            if position is None:
+                break
+            await asyncio.sleep(self.chunk_pause)
+
+        elapsed = time.monotonic() - started
+        self.last_run = {
+            "rows": purged,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round(purged / elapsed, 1) if elapsed else 0.0,
+            "finished_at": datetime.now().isoformat(),
+        }
+        if purged:
+            logger.info(
+                "Purged %d soft-deleted bills in %.1fs (%.1f rows/s)",
+                purged, elapsed, self.last_run["rows_per_second"],
+            )
+        return purged
+
+    async def _check_lag_visible(self, session: AsyncSession) -> None:
+        """Find out once whether replication lag can be read at all.
+
+        With replicas configured the job refuses to run blind; without them
+        the lag check is moot and only a warning is logged.
+        """
+        if self.lag_visible is not None:
+            return
+        self.lag_visible = bool(await session.scalar(LAG_VISIBLE_QUERY))
+        if self.lag_visible:
+            return
+        if settings.DATABASE_REPLICA_URLS:
+            self.lag_visible = None
+            raise RuntimeError(
+                "Bill purge needs pg_monitor to read pg_stat_replication; refusing to run without the lag throttle"
+            )
+        logger.warning("pg_stat_replication is not readable (no pg_monitor); bill purge won't throttle on lag")
+
+    async def _wait_for_headroom(self) -> None:
+        """Sleep while replication lag or lock waiters are above their limits."""
+        while True:
+            async for session in sessionmanager.get_session():
+                await self._check_lag_visible(session)
+                replicas, lag = (await session.execute(REPLICATION_LAG_QUERY)).one()
+                lag = float(lag)
+                waiters = await session.scalar(LOCK_WAITERS_QUERY)
+            if settings.DATABASE_REPLICA_URLS and not replicas and self.lag_visible:
+                # Logged once: replicas fed from elsewhere (e.g. managed storage) don't appear here.
+                self.lag_visible = False
+                logger.warning("Replicas are configured but pg_stat_replication lists none; lag can't be checked")
+            if lag <= self.max_replication_lag and waiters <= self.max_lock_waiters:
+                return
+            self.throttled_total += 1
+            logger.info("Bill purge throttled (replication lag %.1fs, %d lock waiters)", lag, waiters)
+            await asyncio.sleep(self.throttle_sleep)
+
+    async def _purge_chunk(self, cutoff: datetime, position: tuple | None) -> tuple[int, tuple | None]:
+        """Delete one chunk after `position`; return (rows deleted, next position or None when done)."""
+        deleted, next_position = 0, None
+        async for session in sessionmanager.get_session():
+            deleted, next_position = await self._delete_batch(session, cutoff, position)
+        return deleted, next_position
+
+    async def _delete_batch(
+            self, session: AsyncSession, cutoff: datetime, position: tuple | None
+    ) -> tuple[int, tuple | None]:
+        # Deletion time is updated_at, which is never before created_at, so the
+        # created_at bound is redundant but prunes recent partitions.
+        chunk = (
+            select(Bill.created_at, Bill.id)
+            .where(Bill.is_deleted == True, Bill.created_at < cutoff, Bill.updated_at < cutoff)
+            .order_by(Bill.created_at, Bill.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        if position is not None:
+            chunk = chunk.where(Bill.created_at >= position[0], tuple_(Bill.created_at, Bill.id) > position)
+
+        await session.execute(text("SET LOCAL lock_timeout = '2s'"))
+        result = await session.execute(
+            delete(Bill)
+            .where(tuple_(Bill.created_at, Bill.id).in_(chunk))
+            .returning(Bill.created_at, Bill.id, Bill.bill_image_url)
+        )
+        rows = result.all()
+        image_keys = [row.bill_image_url for row in rows if row.bill_image_url]
+        if image_keys:
+            await session.execute(insert(S3DeleteOutbox), [{"object_key": key} for key in image_keys])
+        await session.commit()
+
+        if len(rows) < self.batch_size:
+            return len(rows), None
+        return len(rows), max((row.created_at, row.id) for row in rows)
+
+
+bill_purge_job = BillPurgeJob()
+register_collector("bill_purge", bill_purge_job.snapshot)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--retention-days", type=int, default=settings.BILL_PURGE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.BILL_PURGE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    sessionmanager.init_db()
+    try:
+        job = BillPurgeJob(retention=timedelta(days=args.retention_days), batch_size=args.batch_size)
+        await job.purge()
+        print(f"Purged {job.last_run['rows']} bills ({job.last_run['rows_per_second']} rows/s)")
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
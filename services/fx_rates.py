@@ -0,0 +1,64 @@
+"""Load exchange rates from a local CSV file (columns: date, currency, rate).
+
+Usage: python -m services.fx_rates rates.csv
+"""
+import argparse
+import asyncio
+import csv
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import sessionmanager
+from app.models.fx_rate import FxRate
+
+BATCH_SIZE = 5000
+
+
+async def load_rates_file(path: str) -> int:
+    """Upsert every rate in `path`; return how many rows were read."""
+    loaded = 0
+    async for db in sessionmanager.get_session():
+        with open(path, newline="") as file:
+            batch = []
+            for row in csv.DictReader(file):
+                batch.append({
+                    "currency": row["currency"].strip().upper(),
+                    "rate_date": date.fromisoformat(row["date"].strip()),
+                    "rate": Decimal(row["rate"]),
+                })
+                if len(batch) >= BATCH_SIZE:
+                    await _upsert(db, batch)
+                    loaded += len(batch)
+                    batch = []
+            if batch:
+                await _upsert(db, batch)
+                loaded += len(batch)
+        await db.commit()
+    return loaded
+
+
+async def _upsert(db, batch: list[dict]) -> None:
+    stmt = insert(FxRate).values(batch)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["currency", "rate_date"],
+        set_={"rate": stmt.excluded.rate},
+    ))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    sessionmanager.init_db()
+    try:
+        loaded = await load_rates_file(args.path)
+        print(f"Loaded {loaded} rates")
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
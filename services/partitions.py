@@ -0,0 +1,125 @@
+"""Create upcoming bill partitions and archive old ones.
+
+Usage: python -m services.partitions ensure [--months N]
+       python -m services.partitions archive --before YYYY-MM [--drop]
+
+Archiving detaches every monthly partition that ends on or before the given
+month and moves it to BILL_ARCHIVE_SCHEMA (or drops it with --drop). The
+monthly rollups keep their totals, but `python -m services.rollups` will no
+longer see archived rows.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.partitions import PARTITION_PREFIX, ensure_partition_range, ensure_partitions
+from app.core.periodic import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+# Rows outside every monthly partition, e.g. written before their month existed.
+DEFAULT_PARTITION_MONTHS = text("SELECT DISTINCT date_trunc('month', created_at)::date FROM bills_default")
+
+
+class PartitionMaintainer(PeriodicTask):
+    """Keeps BILL_PARTITIONS_AHEAD months of bill partitions created ahead of time.
+
+    ensure_monthly_partitions() takes an advisory lock, so several API workers
+    can run the maintainer at once.
+    """
+
+    name = "Bill partition maintenance"
+
+    def __init__(
+            self,
+            months_ahead: int = settings.BILL_PARTITIONS_AHEAD,
+            interval: float = settings.BILL_PARTITION_MAINTENANCE_INTERVAL,
+    ) -> None:
+        super().__init__(interval)
+        self.months_ahead = months_ahead
+
+    async def run_once(self) -> None:
+        created = await self.ensure()
+        if created:
+            logger.info("Created %d bill partitions", created)
+
+    async def ensure(self) -> int:
+        """Create any missing partitions from this month on, plus one for every month
+        stranded in bills_default; return how many were created."""
+        created = 0
+        async for session in sessionmanager.get_session():
+            created = await ensure_partition_range(session, date.today(), self.months_ahead)
+            stranded = list(await session.scalars(DEFAULT_PARTITION_MONTHS))
+            await session.commit()
+            created += await ensure_partitions(session, stranded)
+        return created
+
+
+async def archive_partitions(before: date, drop: bool = False) -> list[str]:
+    """Detach monthly partitions older than `before`; return their names.
+
+    DETACH ... CONCURRENTLY is not allowed while bills has a default
+    partition, so each detach takes a brief exclusive lock instead. A short
+    lock_timeout keeps it from queueing behind long transactions; rerun the
+    command if it times out.
+    """
+    cutoff = f"{PARTITION_PREFIX}{before:%Y%m}"
+    archived = []
+    async with sessionmanager.engine.connect() as connection:
+        names = list(await connection.scalars(text(
+            "SELECT c.relname FROM pg_inherits i"
+            " JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = 'bills'::regclass AND c.relname LIKE :pattern AND c.relname < :cutoff"
+            " ORDER BY c.relname"
+        ), {"pattern": f"{PARTITION_PREFIX}______", "cutoff": cutoff}))
+        await connection.commit()
+
+        if not drop:
+            await connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{settings.BILL_ARCHIVE_SCHEMA}"'))
+            await connection.commit()
+        for name in names:
+            await connection.execute(text("SET LOCAL lock_timeout = '5s'"))
+            await connection.execute(text(f'ALTER TABLE bills DETACH PARTITION "{name}"'))
+            if drop:
+                await connection.execute(text(f'DROP TABLE "{name}"'))
+            else:
+                await connection.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{settings.BILL_ARCHIVE_SCHEMA}"'))
+            await connection.commit()
+            archived.append(name)
+            logger.info("Archived partition %s", name)
+    return archived
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    ensure = commands.add_parser("ensure")
+    ensure.add_argument("--months", type=int, default=settings.BILL_PARTITIONS_AHEAD)
+    archive = commands.add_parser("archive")
+    archive.add_argument("--before", type=lambda value: date.fromisoformat(f"{value}-01"), required=True)
+    archive.add_argument("--drop", action="store_true")
+    args = parser.parse_args()
+
+    sessionmanager.init_db()
+    try:
+        if args.command == "ensure":
+            created = await PartitionMaintainer(months_ahead=args.months).ensure()
+            print(f"Created {created} partitions")
+        else:
+            archived = await archive_partitions(args.before, args.drop)
+            print(f"Archived {len(archived)} partitions")
+    finally:
+        await sessionmanager.close()
+
+
+partition_maintainer = PartitionMaintainer()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.periodic import PeriodicTask
+from app.core.recurrence import next_due
+from app.core.versions import bump_bill_version
+from app.crud.rollup import RollupCRUD
+from app.models.bill import Bill
+
+
+class RecurringBillScheduler(PeriodicTask):
+    """Materializes due occurrences of recurring bills.
+
+    Each tick claims up to `batch_size` due templates with
+    SELECT ... FOR UPDATE SKIP LOCKED, so several API workers can run the
+    scheduler at once without creating the same occurrence twice.
+    """
+
+    name = "Recurring bill tick"
+
+    def __init__(
+            self,
+            batch_size: int = settings.RECURRING_BATCH_SIZE,
+            poll_interval: float = settings.RECURRING_POLL_INTERVAL,
+    ) -> None:
+        super().__init__(poll_interval)
+        self.batch_size = batch_size
+
+    async def run_once(self) -> bool:
+        return await self.tick() >= self.batch_size
+
+    async def tick(self) -> int:
+        """Materialize one batch of due occurrences; return how many templates were claimed."""
+        processed = 0
+        async for session in sessionmanager.get_session():
+            processed = await self._materialize_batch(session)
+        return processed
+
+    async def _materialize_batch(self, session: AsyncSession) -> int:
+        now = datetime.now()
+        result = await session.scalars(
+            select(Bill)
+            # Templates are never created in the future; the bound prunes future partitions.
+            .where(Bill.next_due_at <= now, Bill.created_at <= now, Bill.is_deleted == False)
+            .order_by(Bill.next_due_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        templates = result.all()
+        if not templates:
+            await session.commit()
+            return 0
+
+        rollup_deltas: defaultdict[tuple, list] = defaultdict(lambda: [Decimal(0), 0])
+        for template in templates:
+            due_at = template.next_due_at
+            session.add(Bill(
+                id=uuid4(),
+                user_id=template.user_id,
+                category_id=template.category_id,
+                title=template.title,
+                amount=template.amount,
+                currency=template.currency,
+                created_at=due_at,
+                updated_at=now,
+            ))
+            delta = rollup_deltas[(template.user_id, template.category_id, template.currency, due_at.date().replace(day=1))]
+            delta[0] += template.amount
+            delta[1] += 1
+
+            # A template that fell behind catches up one occurrence per tick.
+            template.next_due_at = next_due(
+                template.created_at, template.recurrence, template.recurrence_interval,
+                template.recurrence_end_at, previous=due_at,
+            )
+
+        for (user_id, category_id, currency, month), (amount, count) in rollup_deltas.items():
+            await RollupCRUD.apply_delta(
+                session, user_id, category_id, currency, datetime.combine(month, datetime.min.time()), amount, count
+            )
+        await bump_bill_version(session, *(template.user_id for template in templates))
+        await session.commit()
+        return len(templates)
+
+
+recurring_scheduler = RecurringBillScheduler()
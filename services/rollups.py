@@ -0,0 +1,52 @@
+"""Rebuild bill_monthly_rollups from scratch.
+
+Usage: python -m services.rollups [--batch-size N]
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlmodel import select
+
+from app.core.database import sessionmanager
+from app.crud.rollup import RollupCRUD
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_rollups(batch_size: int = 500) -> int:
+    """Regenerate every user's rollups, `batch_size` users per transaction; return users processed."""
+    processed = 0
+    last_id = None
+    while True:
+        async for db in sessionmanager.get_session():
+            query = select(User.id).order_by(User.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(User.id > last_id)
+            user_ids = list(await db.scalars(query))
+            if user_ids:
+                await RollupCRUD.rebuild_users(db, user_ids)
+        if not user_ids:
+            return processed
+        processed += len(user_ids)
+        last_id = user_ids[-1]
+        logger.info("Rebuilt rollups for %d users", processed)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    sessionmanager.init_db()
+    try:
+        processed = await rebuild_rollups(args.batch_size)
+        print(f"Rebuilt rollups for {processed} users")
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
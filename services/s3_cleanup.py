@@ -0,0 +1,92 @@
+import logging
+from datetime import timedelta
+
+from sqlalchemy import delete, func, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.aws_s3 import delete_files_from_s3_async, key_from_url
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.periodic import PeriodicTask
+from app.models.s3_delete_outbox import S3DeleteOutbox
+
+logger = logging.getLogger(__name__)
+
+
+class S3CleanupWorker(PeriodicTask):
+    """Drains s3_delete_outbox in batches, retrying failures with exponential backoff."""
+
+    name = "S3 cleanup batch"
+
+    def __init__(
+            self,
+            batch_size: int = settings.S3_CLEANUP_BATCH_SIZE,
+            poll_interval: float = settings.S3_CLEANUP_POLL_INTERVAL,
+            max_attempts: int = settings.S3_CLEANUP_MAX_ATTEMPTS,
+            max_backoff: float = 3600.0,
+    ) -> None:
+        super().__init__(poll_interval)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+
+    async def run_once(self) -> bool:
+        return await self.drain_once() >= self.batch_size
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.max_backoff, 2 ** attempts))
+
+    async def drain_once(self) -> int:
+        """Process one batch of due outbox rows; return how many were claimed."""
+        processed = 0
+        async for session in sessionmanager.get_session():
+            processed = await self._drain_batch(session)
+        return processed
+
+    async def _drain_batch(self, session: AsyncSession) -> int:
+        result = await session.execute(
+            select(S3DeleteOutbox.id, S3DeleteOutbox.object_key, S3DeleteOutbox.attempts)
+            .where(
+                S3DeleteOutbox.next_attempt_at <= func.now(),
+                S3DeleteOutbox.attempts < self.max_attempts,
+            )
+            .order_by(S3DeleteOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.all()
+        if not rows:
+            await session.commit()
+            return 0
+
+        try:
+            failed_keys = set(await delete_files_from_s3_async(row.object_key for row in rows))
+            error = "S3 reported delete error"
+        except Exception as e:
+            failed_keys = {key_from_url(row.object_key) for row in rows}
+            error = repr(e)
+
+        failed_rows = [row for row in rows if key_from_url(row.object_key) in failed_keys]
+        done_ids = [row.id for row in rows if key_from_url(row.object_key) not in failed_keys]
+        if done_ids:
+            await session.execute(delete(S3DeleteOutbox).where(S3DeleteOutbox.id.in_(done_ids)))
+
+        for row in failed_rows:
+            await session.execute(
+                update(S3DeleteOutbox)
+                .where(S3DeleteOutbox.id == row.id)
+                .values(
+                    attempts=row.attempts + 1,
+                    last_error=error,
+                    next_attempt_at=func.now() + self._backoff(row.attempts + 1),
+                )
+            )
+
+        await session.commit()
+        if failed_rows:
+            logger.warning("Failed to delete %d S3 objects, will retry", len(failed_rows))
+        return len(rows)
+
+
+s3_cleanup_worker = S3CleanupWorker()
@@ -0,0 +1,51 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+
+from app.crud.bill import BillCRUD
+from app.models.s3_delete_outbox import S3DeleteOutbox
+from app.schemas.bill import BillCreate
+
+pytestmark = pytest.mark.anyio
+
+
+def bill_for(user_id, **overrides) -> BillCreate:
+    return BillCreate(title="Internet", amount=Decimal("12.50"), currency="USD", user_id=user_id, **overrides)
+
+
+async def test_create_bill_is_insert_plus_rollup(db, user, statements):
+    bill = await BillCRUD.create_bill(db, bill_for(user.id))
+
+    assert bill.user_id == user.id
+    # INSERT ... RETURNING, the rollup upsert and the bill version bump; no pre-check or refresh SELECTs.
+    assert len(statements) == 3, statements
+
+
+async def test_create_bill_with_image_claims_reservation(db, user, statements):
+    key = f"bills/{uuid4()}.png"
+    await BillCRUD.reserve_image_key(db, key)
+    assert len(statements) == 1, statements
+
+    statements.clear()
+    await BillCRUD.create_bill(db, bill_for(user.id, bill_image_url=key))
+
+    # INSERT ... RETURNING, rollup upsert, outbox DELETE and version bump, all in one transaction.
+    assert len(statements) == 4, statements
+    assert await db.scalar(select(S3DeleteOutbox.id).where(S3DeleteOutbox.object_key == key)) is None
+
+
+async def test_failed_create_keeps_image_reservation(db):
+    key = f"bills/{uuid4()}.png"
+    await BillCRUD.reserve_image_key(db, key)
+
+    with pytest.raises(HTTPException) as error:
+        await BillCRUD.create_bill(db, bill_for(uuid4(), bill_image_url=key))
+
+    assert error.value.status_code == 400
+    reservation = await db.scalar(select(S3DeleteOutbox).where(S3DeleteOutbox.object_key == key))
+    assert reservation is not None
+    await db.delete(reservation)
+    await db.commit()
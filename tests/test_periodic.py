@@ -0,0 +1,40 @@
+import asyncio
+
+from app.core.periodic import PeriodicTask
+
+
+class Counter(PeriodicTask):
+    def __init__(self, busy_passes: int, fail_on: int | None = None) -> None:
+        super().__init__(interval=3600)
+        self.busy_passes = busy_passes
+        self.fail_on = fail_on
+        self.passes = 0
+
+    async def run_once(self) -> bool:
+        self.passes += 1
+        if self.passes == self.fail_on:
+            raise RuntimeError("boom")
+        return self.passes <= self.busy_passes
+
+
+async def run_briefly(task: PeriodicTask) -> None:
+    task.start()
+    await asyncio.sleep(0.05)
+    await task.stop()
+
+
+def test_busy_passes_run_back_to_back_then_sleep():
+    task = Counter(busy_passes=3)
+    asyncio.run(run_briefly(task))
+
+    # Three busy passes, then one idle pass before the long sleep.
+    assert task.passes == 4
+    assert task._task is None
+
+
+def test_failure_is_logged_and_sleeps(caplog):
+    task = Counter(busy_passes=5, fail_on=2)
+    asyncio.run(run_briefly(task))
+
+    assert task.passes == 2
+    assert "Periodic task failed" in caplog.text
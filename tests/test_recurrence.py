@@ -0,0 +1,108 @@
+from datetime import datetime
+
+from app.core.recurrence import next_due, next_occurrence, occurrence_index
+
+
+def occurrences(anchor: datetime, recurrence, interval: int = 1, count: int = 4) -> list[datetime]:
+    """The first `count` occurrences, each computed from the previous one like the scheduler does."""
+    result, previous = [], None
+    for _ in range(count):
+        previous = next_occurrence(anchor, recurrence, interval, previous)
+        result.append(previous)
+    return result
+
+
+def test_monthly_month_end_is_clamped_per_occurrence():
+    anchor = datetime(2025, 1, 31, 9, 30)
+
+    assert occurrences(anchor, "monthly") == [
+        datetime(2025, 2, 28, 9, 30),
+        datetime(2025, 3, 31, 9, 30),
+        datetime(2025, 4, 30, 9, 30),
+        datetime(2025, 5, 31, 9, 30),
+    ]
+
+
+def test_monthly_leap_year():
+    assert occurrences(datetime(2024, 1, 31), "monthly", count=2) == [datetime(2024, 2, 29), datetime(2024, 3, 31)]
+
+
+def test_monthly_interval():
+    assert occurrences(datetime(2025, 1, 31), "monthly", interval=3, count=3) == [
+        datetime(2025, 4, 30),
+        datetime(2025, 7, 31),
+        datetime(2025, 10, 31),
+    ]
+
+
+def test_daily():
+    assert occurrences(datetime(2025, 2, 27), "daily", count=3) == [
+        datetime(2025, 2, 28),
+        datetime(2025, 3, 1),
+        datetime(2025, 3, 2),
+    ]
+
+
+def test_daily_interval():
+    assert occurrences(datetime(2025, 12, 30), "daily", interval=2, count=2) == [
+        datetime(2026, 1, 1),
+        datetime(2026, 1, 3),
+    ]
+
+
+def test_weekly_interval():
+    assert occurrences(datetime(2025, 1, 6), "weekly", interval=2, count=3) == [
+        datetime(2025, 1, 20),
+        datetime(2025, 2, 3),
+        datetime(2025, 2, 17),
+    ]
+
+
+def test_yearly_from_leap_day():
+    assert occurrences(datetime(2024, 2, 29), "yearly", count=4) == [
+        datetime(2025, 2, 28),
+        datetime(2026, 2, 28),
+        datetime(2027, 2, 28),
+        datetime(2028, 2, 29),
+    ]
+
+
+def test_yearly_interval():
+    assert occurrences(datetime(2025, 3, 15), "yearly", interval=2, count=2) == [
+        datetime(2027, 3, 15),
+        datetime(2029, 3, 15),
+    ]
+
+
+def test_occurrence_index_counts_whole_periods():
+    anchor = datetime(2025, 1, 31)
+
+    assert occurrence_index(anchor, "monthly", 1, anchor) == 0
+    assert occurrence_index(anchor, "monthly", 1, datetime(2025, 2, 28)) == 1
+    assert occurrence_index(anchor, "monthly", 2, datetime(2025, 3, 31)) == 1
+    assert occurrence_index(anchor, "yearly", 1, datetime(2026, 1, 31)) == 1
+    assert occurrence_index(anchor, "weekly", 1, datetime(2025, 2, 13)) == 1
+    assert occurrence_index(anchor, "weekly", 1, datetime(2025, 2, 14)) == 2
+    assert occurrence_index(anchor, "daily", 3, datetime(2025, 2, 5)) == 1
+
+
+def test_occurrence_index_round_trips_next_occurrence():
+    anchor = datetime(2025, 1, 31)
+    for recurrence in ("daily", "weekly", "monthly", "yearly"):
+        for interval in (1, 2, 5):
+            for index, due_at in enumerate(occurrences(anchor, recurrence, interval, count=6), start=1):
+                assert occurrence_index(anchor, recurrence, interval, due_at) == index, (recurrence, interval)
+
+
+def test_next_due_stops_after_end():
+    anchor = datetime(2025, 1, 31)
+    end_at = datetime(2025, 3, 31)
+
+    assert next_due(anchor, "monthly", 1, end_at) == datetime(2025, 2, 28)
+    # An occurrence exactly at the end is still due.
+    assert next_due(anchor, "monthly", 1, end_at, previous=datetime(2025, 2, 28)) == end_at
+    assert next_due(anchor, "monthly", 1, end_at, previous=end_at) is None
+
+
+def test_next_due_without_end():
+    assert next_due(datetime(2025, 1, 1), "weekly", 1, None, previous=datetime(2029, 12, 26)) == datetime(2030, 1, 2)
@@ -0,0 +1,101 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException
+
+from app.core.streaming import INVALID_UTF8, iter_records
+
+pytestmark = pytest.mark.anyio
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def records(data: bytes, fmt: str, size: int = 4096) -> list:
+    return [record async for record in iter_records(chunked(data, size), fmt)]
+
+
+CSV = "title,amount,currency\nCafé ☕,3.50,EUR\nRent,900,USD\n".encode()
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 4096])
+async def test_csv_chunk_boundaries_inside_lines_and_characters(size):
+    # Size 1 and 2 split the multibyte é and ☕ across chunks.
+    assert await records(CSV, "csv", size) == [
+        (1, {"title": "Café ☕", "amount": "3.50", "currency": "EUR"}),
+        (2, {"title": "Rent", "amount": "900", "currency": "USD"}),
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+async def test_csv_quoted_newlines_and_quotes(size):
+    data = b'title,amount,currency\n"Line one\nline ""two""",1,USD\r\n"a,b",2,EUR\n'
+
+    assert await records(data, "csv", size) == [
+        (1, {"title": 'Line one\nline "two"', "amount": "1", "currency": "USD"}),
+        (2, {"title": "a,b", "amount": "2", "currency": "EUR"}),
+    ]
+
+
+async def test_csv_bom_is_stripped():
+    assert await records(b"\xef\xbb\xbf" + CSV, "csv", 2) == await records(CSV, "csv")
+
+
+async def test_csv_empty_values_become_none_and_blank_lines_are_skipped():
+    data = b"title,amount,currency\n\nTea,,\n"
+
+    assert await records(data, "csv") == [(1, {"title": "Tea", "amount": None, "currency": None})]
+
+
+async def test_csv_bad_utf8_fails_only_its_row():
+    data = b"title,amount,currency\nBad \xff\xfe,1,USD\nGood,2,USD\n"
+
+    assert await records(data, "csv", 3) == [
+        (1, INVALID_UTF8),
+        (2, {"title": "Good", "amount": "2", "currency": "USD"}),
+    ]
+
+
+async def test_csv_column_count_mismatch():
+    data = b"title,amount,currency\nTea,1\n"
+
+    assert await records(data, "csv") == [(1, "Expected 3 columns, got 2")]
+
+
+async def test_csv_last_line_without_newline():
+    data = b"title,amount,currency\nTea,1,USD"
+
+    assert await records(data, "csv", 5) == [(1, {"title": "Tea", "amount": "1", "currency": "USD"})]
+
+
+async def test_csv_bad_header_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        await records(b"\xff,amount\nTea,1\n", "csv")
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("size", [1, 3, 4096])
+async def test_ndjson(size):
+    data = '{"title": "Café", "amount": "1"}\n\n{"title": "Tea"}'.encode()
+
+    assert await records(data, "ndjson", size) == [
+        (1, {"title": "Café", "amount": "1"}),
+        (2, {"title": "Tea"}),
+    ]
+
+
+async def test_ndjson_malformed_lines_fail_only_their_row():
+    data = b'{"title": "Tea"\n[1, 2]\n\xff\n{"title": "Rent"}\n'
+
+    result = await records(data, "ndjson")
+
+    assert result[0][0] == 1 and result[0][1].startswith("Invalid JSON")
+    assert result[1:] == [(2, "Expected a JSON object"), (3, INVALID_UTF8), (4, {"title": "Rent"})]
+
+
+async def test_unsupported_format():
+    with pytest.raises(HTTPException):
+        await records(b"", "xml")